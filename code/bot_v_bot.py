@@ -1,5 +1,5 @@
 from dlgo import agent
-from dlgo import goboard
+from dlgo import goboard_fast as goboard
 from dlgo import gotypes
 from dlgo.utils import print_board, print_move
 import time
@@ -9,8 +9,8 @@ BOARD_SIZE = 5
 def main():
     game = goboard.GameState.new_game(BOARD_SIZE)
     bots = {
-        gotypes.Player.black: agent.MCTSAgent(500, temperature=1.4),
-        gotypes.Player.white: agent.MCTSAgent(500, temperature=1.4),
+        gotypes.Player.black: agent.MCTSAgent(500, temperature=1.4, reuse_tree=True),
+        gotypes.Player.white: agent.MCTSAgent(500, temperature=1.4, reuse_tree=True),
     }
     previous_move = None
 
@@ -0,0 +1,23 @@
+import argparse
+
+from dlgo.data import deduplicate
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Merge repeated positions of a sharded dataset into policy targets.')
+    parser.add_argument('source', help='Directory written by generate_mcts_games.py --out-dir.')
+    parser.add_argument('destination', help='Directory for the deduplicated shards.')
+    parser.add_argument('--canonical', '-c', action='store_true',
+                        help='Treat rotated and reflected copies of a position as the same.')
+    parser.add_argument('--policy-width', type=int, default=None,
+                        help='Most played moves kept for each position (default: all of them).')
+    parser.add_argument('--shard-size', type=int, default=4096)
+
+    args = parser.parse_args()
+    num_positions = deduplicate(
+        args.source, args.destination, canonical=args.canonical,
+        policy_width=args.policy_width, shard_size=args.shard_size)
+    print('Wrote %d distinct positions to %s' % (num_positions, args.destination))
+
+if __name__ == '__main__':
+    main()
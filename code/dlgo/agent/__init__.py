@@ -1,4 +1,6 @@
 from .base import *
 from .helpers import *
 from .naive import *
-from .mcts import *
\ No newline at end of file
+from .mcts import *
+from .compact_mcts import *
+from .neural import *
@@ -0,0 +1,186 @@
+import math
+import time
+
+import numpy as np
+
+from dlgo.agent.mcts import MCTSAgent
+from dlgo.goboard import Move
+from dlgo.gotypes import Point
+
+__all__ = [
+    'CompactMCTSAgent',
+    'NodeStore',
+]
+
+class NodeStore(object):
+    '''
+    A search tree kept in parallel NumPy arrays instead of one object per node, about
+    24 bytes a node. Node 0 is the root. The children of a node are stored next to each
+    other, from first_child[node] to first_child[node] + num_children[node]; num_children
+    is -1 until the node is expanded. Moves are stored as integers (see CompactMCTSAgent)
+    and wins are counted for the player who made the move into the node.
+    '''
+    def __init__(self, capacity=4096):
+        self.size = 0
+        self.visits = np.zeros(capacity, dtype=np.int32)
+        self.wins = np.zeros(capacity, dtype=np.int32)
+        self.parent = np.zeros(capacity, dtype=np.int32)
+        self.move = np.zeros(capacity, dtype=np.int32)
+        self.first_child = np.zeros(capacity, dtype=np.int32)
+        self.num_children = np.zeros(capacity, dtype=np.int32)
+        self.add_root()
+
+    def add_root(self):
+        self.size = 1
+        self.visits[0] = 0
+        self.wins[0] = 0
+        self.parent[0] = -1
+        self.move[0] = -1
+        self.num_children[0] = -1
+
+    def expand(self, node, moves):
+        # Adds one child per move code in a single block and returns the index of the first one
+        count = len(moves)
+        self._reserve(self.size + count)
+        first = self.size
+        block = slice(first, first + count)
+        self.visits[block] = 0
+        self.wins[block] = 0
+        self.parent[block] = node
+        self.move[block] = moves
+        self.num_children[block] = -1
+        self.first_child[node] = first
+        self.num_children[node] = count
+        self.size += count
+        return first
+
+    def children(self, node):
+        first = self.first_child[node]
+        return range(first, first + max(self.num_children[node], 0))
+
+    def _reserve(self, capacity):
+        # Doubles every array until it can hold the requested number of nodes
+        old_capacity = len(self.visits)
+        if capacity <= old_capacity:
+            return
+        new_capacity = old_capacity
+        while new_capacity < capacity:
+            new_capacity *= 2
+        for name in ('visits', 'wins', 'parent', 'move', 'first_child', 'num_children'):
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+
+
+class CompactMCTSAgent(MCTSAgent):
+    '''
+    The same search as MCTSAgent, with the tree in a NodeStore. Nodes do not keep a
+    GameState: each round copies the root state once and replays the moves on the way
+    down with GameState.play. Children are all allocated when a node is first reached,
+    unvisited ones are tried in random order, and after that UCT picks between them in
+    one vectorised step.
+    Moves are coded as row-major point indices, then num_points for a pass and
+    num_points + 1 for resigning.
+    The budgets, search(), on_progress and collect_ownership behave as in MCTSAgent; the parallel modes,
+    tree reuse and the transposition table are not available.
+    '''
+    def __init__(self, num_rounds, temperature, seed=None, max_seconds=None, max_nodes=None,
+                 report_interval=1.0, on_progress=None, capacity=4096, collect_ownership=False):
+        MCTSAgent.__init__(
+            self, num_rounds, temperature, seed=seed, max_seconds=max_seconds,
+            max_nodes=max_nodes, report_interval=report_interval, on_progress=on_progress,
+            collect_ownership=collect_ownership)
+        self.capacity = capacity
+
+    def search(self, game_state):
+        self._reset_ownership()
+        store = NodeStore(self.capacity)
+        num_cols = game_state.board.num_cols
+        num_points = game_state.board.num_rows * num_cols
+        start = time.monotonic()
+        next_report = start + self.report_interval
+        rounds = 0
+        while self._within_budget(rounds, store.size, start):
+            self._compact_round(store, game_state, num_cols, num_points)
+            rounds += 1
+            if time.monotonic() >= next_report:
+                yield self._stats(
+                    self._store_stats(store, num_cols, num_points), rounds, store.size, start)
+                next_report = time.monotonic() + self.report_interval
+        yield self._stats(self._store_stats(store, num_cols, num_points), rounds, store.size, start)
+
+    def _compact_round(self, store, root_state, num_cols, num_points):
+        '''
+        1. Walk down from the root, replaying each move on a copy of the root state and
+            expanding nodes the first time they are reached
+        2. Stop at the first unvisited node (or at the end of the game)
+        3. Play out from there and add the result to every node on the path
+        '''
+        state = root_state.copy()
+        node = 0
+        path = [0]
+        while not state.is_over():
+            if store.num_children[node] < 0:
+                moves = [self._encode_move(move, num_cols, num_points)
+                         for move in state.legal_moves()]
+                store.expand(node, moves)
+            node = self.select_compact_child(store, node)
+            state.play(self._decode_move(int(store.move[node]), num_cols, num_points))
+            path.append(node)
+            if store.visits[node] == 1:
+                # select_compact_child has just claimed this node, so it is a new leaf
+                break
+
+        winner = self._rollout(state)
+        # The player who moved into a node alternates with depth, starting with the root player
+        store.visits[path[0]] += 1
+        mover = root_state.next_player
+        for node in path[1:]:
+            if mover == winner:
+                store.wins[node] += 1
+            mover = mover.other
+
+    def select_compact_child(self, store, node):
+        '''
+        Picks a random unvisited child while there is one, otherwise the child with the
+        best UCT score, scored for all children at once. The chosen child's visit is
+        counted straight away.
+        '''
+        first = store.first_child[node]
+        count = store.num_children[node]
+        visits = store.visits[first:first + count]
+        unvisited = np.flatnonzero(visits == 0)
+        if len(unvisited) > 0:
+            child = first + int(unvisited[self._rng.randint(0, len(unvisited) - 1)])
+        else:
+            wins = store.wins[first:first + count]
+            log_rollouts = math.log(visits.sum())
+            uct_scores = wins / visits + self.temperature * np.sqrt(log_rollouts / visits)
+            child = first + int(np.argmax(uct_scores))
+        store.visits[child] += 1
+        return child
+
+    def _store_stats(self, store, num_cols, num_points):
+        return {
+            self._decode_move(int(store.move[child]), num_cols, num_points):
+                (int(store.wins[child]), int(store.visits[child]))
+            for child in store.children(0)
+            if store.visits[child] > 0
+        }
+
+    @staticmethod
+    def _encode_move(move, num_cols, num_points):
+        if move.is_pass:
+            return num_points
+        if move.is_resign:
+            return num_points + 1
+        return (move.point.row - 1) * num_cols + (move.point.col - 1)
+
+    @staticmethod
+    def _decode_move(code, num_cols, num_points):
+        if code == num_points:
+            return Move.pass_turn()
+        if code == num_points + 1:
+            return Move.resign()
+        return Move.play(Point(row=code // num_cols + 1, col=code % num_cols + 1))
@@ -1,15 +1,80 @@
 import math
+import os
 import random
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 from dlgo import agent
 from dlgo.gotypes import Player
 from dlgo.utils import coords_from_point
 from dlgo.goboard import GameState, Move
+from dlgo.playout import random_playout
 
 __all__ = [
     'MCTSAgent',
+    'SearchStats',
+    'TranspositionTable',
 ]
 
+class SearchStats(namedtuple('SearchStats', 'best_move rounds nodes elapsed move_stats ownership',
+                             defaults=(None,))):
+    '''
+    A progress report from MCTSAgent.search: the best move so far, how many rounds have been
+    played, how many tree nodes this search has added (counting the root), the seconds spent
+    and {move: (wins, rollouts)} for every root move, with wins counted for the player to move.
+    With collect_ownership, ownership is the average owner of every point at the end of the
+    rollouts so far, as a float array [row - 1, col - 1] from +1 (always black) to -1 (always
+    white); otherwise it is None.
+    '''
+    @property
+    def value(self):
+        # The fraction of the rollouts through the root moves that the player to move won
+        wins = sum(wins for wins, _ in self.move_stats.values())
+        rollouts = sum(rollouts for _, rollouts in self.move_stats.values())
+        return float(wins) / rollouts if rollouts else 0.5
+
+class TranspositionTable(object):
+    '''
+    Shares MCTSNodes between positions reached by different move orders, keyed by
+    (next_player, zobrist hash, whether the last move was a pass, whether the game is over).
+    The last two keep a finished game apart from the live position with the same stones,
+    e.g. the one two passes earlier. Holds at most max_size nodes and forgets the least recently
+    used one when it is full; a forgotten node stays in the tree, it is just no longer shared.
+    '''
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._nodes = OrderedDict()
+
+    @staticmethod
+    def key(game_state):
+        last_move = game_state.last_move
+        passed = last_move is not None and last_move.is_pass
+        return (game_state.next_player, game_state.board.zobrist_hash(), passed,
+                game_state.is_over())
+
+    def get(self, game_state):
+        key = self.key(game_state)
+        node = self._nodes.get(key)
+        if node is not None:
+            self._nodes.move_to_end(key)
+        return node
+
+    def put(self, node):
+        self._nodes[self.key(node.game_state)] = node
+        self._nodes.move_to_end(self.key(node.game_state))
+        if len(self._nodes) > self.max_size:
+            self._nodes.popitem(last=False)
+
+    def clear(self):
+        self._nodes.clear()
+
+    def __len__(self):
+        return len(self._nodes)
+
+
 class MCTSNode(object):
     def __init__(self, game_state, parent=None, move=None):
         self.game_state = game_state
@@ -21,20 +86,42 @@ class MCTSNode(object):
         }
         self.num_rollouts = 0
         self.children = []
+        # The move leading to each child. A node shared through a transposition table can
+        # be reached by different moves from different parents, so the edge keeps its own.
+        self.child_moves = []
         self.unvisited_moves = game_state.legal_moves()
 
-    def add_random_child(self):
-        index = random.randint(0, len(self.unvisited_moves) - 1)
+    def add_random_child(self, rng=random, table=None):
+        '''
+        Expands one random unvisited move. With a transposition table, a position that is
+        already in the search is linked in as the child instead of getting a node of its own.
+        Returns the child and whether it is a new node.
+        '''
+        index = rng.randint(0, len(self.unvisited_moves) - 1)
         new_move = self.unvisited_moves.pop(index)
         new_game_state = self.game_state.apply_move(new_move)
-        new_node = MCTSNode(new_game_state, self, new_move)
+        new_node = None if table is None else table.get(new_game_state)
+        created = new_node is None
+        if created:
+            new_node = MCTSNode(new_game_state, self, new_move)
+            if table is not None:
+                table.put(new_node)
         self.children.append(new_node)
-        return new_node
-    
+        self.child_moves.append(new_move)
+        return new_node, created
+
     def record_win(self, winner):
         self.win_counts[winner] += 1
         self.num_rollouts += 1
 
+    def add_virtual_loss(self):
+        # Counts a rollout that is still running as a loss for both players, so other
+        # searchers are steered away from this node until the real result comes back
+        self.num_rollouts += 1
+
+    def remove_virtual_loss(self):
+        self.num_rollouts -= 1
+
     def can_add_child(self):
         return len(self.unvisited_moves) > 0
 
@@ -46,51 +133,349 @@ class MCTSNode(object):
 
 
 class MCTSAgent(agent.Agent):
-    def __init__(self, num_rounds, temperature):
+    '''
+    Monte Carlo tree search. The search stops at whichever budget runs out first:
+    num_rounds rollouts, max_seconds of wall time or max_nodes tree nodes (None switches
+    a budget off, and at least one has to be set). search() yields SearchStats every
+    report_interval seconds while it runs, and select_move() hands each of them to
+    on_progress if one is given.
+
+    The search can run in parallel on a pool of processes:
+    - parallel='root' --> every worker grows its own tree from the same position and the
+        root statistics of all trees are added together before picking the move
+    - parallel='tree' --> one tree in this process; several leaves are picked at once (with
+        virtual loss keeping them apart) and their rollouts run on the workers
+    Every worker tree and every rollout sent to a worker gets its own seed drawn from seed,
+    and results are taken back in the order they were sent out, so a seeded agent searches
+    the same way on every run as long as its budget is rounds or nodes (max_seconds stops
+    after however much work fits in the time).
+
+    With reuse_tree=True the agent keeps its tree after each move. When it is next asked
+    to move in a game that continued from that position, the search starts from the subtree
+    of the moves actually played, and the rest of the old tree is dropped. Root-parallel
+    trees live in the workers, so they are always built from scratch.
+
+    transposition_table_size turns the tree into a DAG: nodes are shared by
+    position (see TranspositionTable.key) through a TranspositionTable of that many entries, and
+    results are backed up along the path that was actually walked. A shared node keeps the
+    legal moves of the history it was first reached with.
+
+    With collect_ownership=True every rollout also scores who owns each point of its final
+    board, and the average is reported in SearchStats.ownership and kept in
+    last_ownership after select_move(). It costs nothing extra in rollouts, so it gives a
+    territory estimate for the position that was searched.
+    '''
+    def __init__(self, num_rounds, temperature, parallel=None, num_workers=None, seed=None,
+                 max_seconds=None, max_nodes=None, report_interval=1.0, on_progress=None,
+                 reuse_tree=False, transposition_table_size=None, collect_ownership=False):
         agent.Agent.__init__(self)
+        assert parallel in (None, 'root', 'tree')
+        assert num_rounds is not None or max_seconds is not None or max_nodes is not None
         self.num_rounds = num_rounds
         self.temperature = temperature
-    
+        self.parallel = parallel
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.max_seconds = max_seconds
+        self.max_nodes = max_nodes
+        self.report_interval = report_interval
+        self.on_progress = on_progress
+        self.reuse_tree = reuse_tree
+        self.collect_ownership = collect_ownership
+        self.last_ownership = None
+        self._ownership_sum = None
+        self._ownership_count = 0
+        self._table = None
+        if transposition_table_size is not None:
+            self._table = TranspositionTable(transposition_table_size)
+        self._rng = random if seed is None else random.Random(seed)
+        self._executor = None
+        self._root = None
+
     def select_move(self, game_state):
         '''
         1. Start at the current Game State
-        2. So long as the node has viable gameplay & isn't a game end, 
+        2. So long as the node has viable gameplay & isn't a game end,
             select a random child and simulate the game till the end
-        3. Record the game score and add the score to all preceeding 
+        3. Record the game score and add the score to all preceeding
             nodes in that game
-        4. After performing x amount of rounds, select the best move
+        4. Once the budget is used up, select the best move
             by selecting the child with the highest winning percentage
         '''
-        root = MCTSNode(game_state)
+        return self.select_move_with_stats(game_state)[0]
 
-        for count in range(self.num_rounds):
-            node = root
-            while (not node.can_add_child()) and (not node.is_terminal()):
-                node = self.select_child(node)
-            
-            if node.can_add_child():
-                node = node.add_random_child()
+    def select_move_with_stats(self, game_state):
+        '''
+        Same as select_move, but returns (move, stats) where stats is the final SearchStats
+        of the search: the wins and rollouts of every root move, the root value and the
+        ownership map if it is collected.
+        '''
+        stats = None
+        for stats in self.search(game_state):
+            if self.on_progress is not None:
+                self.on_progress(stats)
+        self.last_ownership = stats.ownership
+        return stats.best_move, stats
 
-            winner = self.simulate_random_game(node.game_state)
+    def search(self, game_state):
+        '''
+        Runs the search as a generator: yields SearchStats about every report_interval
+        seconds, and always once more when the budget is used up. The last report holds
+        the move the agent plays.
+        '''
+        self._reset_ownership()
+        if self.parallel == 'root':
+            yield from self._root_parallel_search(game_state)
+            return
 
-            while node is not None:
-                node.record_win(winner)
-                node = node.parent
-        
+        root = self._reused_root(game_state) if self.reuse_tree else None
+        if self._table is not None and root is None:
+            # Without a reused tree, nodes from earlier searches would only take up space
+            self._table.clear()
+        if root is None:
+            root = MCTSNode(game_state)
+        if self._table is not None:
+            self._table.put(root)
+        if self.reuse_tree:
+            self._root = root
+        if self.parallel == 'tree':
+            yield from self._tree_parallel_search(root)
+            return
+
+        start = time.monotonic()
+        next_report = start + self.report_interval
+        rounds = 0
+        nodes = 1
+        while self._within_budget(rounds, nodes, start):
+            if self._search_round(root):
+                nodes += 1
+            rounds += 1
+            if time.monotonic() >= next_report:
+                yield self._stats(self._root_stats(root), rounds, nodes, start)
+                next_report = time.monotonic() + self.report_interval
+        yield self._stats(self._root_stats(root), rounds, nodes, start)
+
+    def _reused_root(self, game_state):
+        '''
+        Finds the node of the previous tree that matches game_state:
+        1. Walk back through game_state's previous states until reaching the state the old
+            tree was searched from, collecting the moves played since
+        2. Follow those moves down the old tree
+        3. Cut the matching node loose, so the rest of the old tree can be freed, and give it
+            game_state, so the walk back finds it again on the next move
+        Returns None if the game did not continue from the old root or the moves were never
+        expanded.
+        '''
+        old_root = self._root
+        self._root = None
+        if old_root is None:
+            return None
+        moves = []
+        state = game_state
+        while state is not old_root.game_state:
+            if state is None or state.last_move is None:
+                return None
+            moves.append(state.last_move)
+            state = state.previous_state
+
+        node = old_root
+        for move in reversed(moves):
+            if move not in node.child_moves:
+                return None
+            node = node.children[node.child_moves.index(move)]
+        node.parent = None
+        node.game_state = game_state
+        return node
+
+    def _within_budget(self, rounds, nodes, start):
+        if self.num_rounds is not None and rounds >= self.num_rounds:
+            return False
+        if self.max_nodes is not None and nodes >= self.max_nodes:
+            return False
+        if self.max_seconds is not None and time.monotonic() - start >= self.max_seconds:
+            return False
+        return True
+
+    def _stats(self, move_stats, rounds, nodes, start, ownership=None):
+        if ownership is None:
+            ownership = self._ownership()
+        return SearchStats(
+            self._best_move(move_stats), rounds, nodes, time.monotonic() - start, move_stats,
+            ownership)
+
+    def _reset_ownership(self):
+        self._ownership_sum = None
+        self._ownership_count = 0
+
+    def _add_ownership(self, ownership):
+        # Rollouts that end in a resignation have no final position to score
+        if ownership is None:
+            return
+        if self._ownership_sum is None:
+            self._ownership_sum = np.zeros(ownership.shape, dtype=np.int32)
+        self._ownership_sum += ownership
+        self._ownership_count += 1
+
+    def _ownership(self):
+        if self._ownership_count == 0:
+            return None
+        return self._ownership_sum / self._ownership_count
+
+    def _rollout(self, game_state):
+        # Plays out from game_state and returns the winner, adding up ownership if asked to
+        if not self.collect_ownership:
+            return self.simulate_random_game(game_state, self._rng)
+        result = random_playout(game_state, self._rng, with_ownership=True)
+        self._add_ownership(result.ownership)
+        return result.winner
+
+    def _search_round(self, root):
+        # Plays one round and returns True if it added a node to the tree
+        path, expanded = self._select_path(root)
+        winner = self._rollout(path[-1].game_state)
+        for node in path:
+            node.record_win(winner)
+        return expanded
+
+    def _select_path(self, root):
+        '''
+        Walks down from the root and expands one move. Returns the nodes visited, root first,
+        and whether a new node was created. In a DAG a walk can come back to a node it has
+        already visited (through a pass); the walk stops there and plays out from that node.
+        '''
+        node = root
+        path = [root]
+        while (not node.can_add_child()) and (not node.is_terminal()):
+            node = self.select_child(node)
+            if self._table is not None and node in path:
+                return path, False
+            path.append(node)
+
+        if node.can_add_child():
+            child, created = node.add_random_child(self._rng, self._table)
+            if self._table is None or child not in path:
+                path.append(child)
+            return path, created
+        return path, False
+
+    @staticmethod
+    def _root_stats(root):
+        # {move: (wins for the player to move at the root, rollouts)} for every child of the root
+        player = root.game_state.next_player
+        return {
+            move: (child.win_counts[player], child.num_rollouts)
+            for move, child in zip(root.child_moves, root.children)
+            if child.num_rollouts > 0
+        }
+
+    @staticmethod
+    def _best_move(stats):
         best_move = None
         best_percentage = -1.0
-        for child in root.children:
-            child_pct = child.winning_frac(game_state.next_player)
+        for move, (wins, rollouts) in stats.items():
+            child_pct = float(wins) / float(rollouts)
             if child_pct > best_percentage:
                 best_percentage = child_pct
-                best_move = child.move
+                best_move = move
         return best_move
 
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        return self._executor
+
+    def close(self):
+        # Shuts down the worker processes used by the parallel modes
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _root_parallel_search(self, game_state):
+        '''
+        Gives every worker its own tree with an equal share of the round and node budgets
+        (and the full time budget), and adds up the wins and rollouts every tree recorded for
+        each root move. A report is yielded as each worker finishes, taken in order.
+        Ownership maps are averaged over the workers, weighted by their rounds.
+        '''
+        start = time.monotonic()
+        num_rounds = None
+        if self.num_rounds is not None:
+            num_rounds = math.ceil(self.num_rounds / self.num_workers)
+        max_nodes = None
+        if self.max_nodes is not None:
+            max_nodes = math.ceil(self.max_nodes / self.num_workers)
+        pool = self._pool()
+        futures = [
+            pool.submit(_search_worker, (
+                game_state, self.temperature, self._rng.randrange(2 ** 31),
+                num_rounds, self.max_seconds, max_nodes, self.collect_ownership))
+            for _ in range(self.num_workers)
+        ]
+        stats = {}
+        rounds = 0
+        nodes = 0
+        ownership_sum = None
+        ownership_rounds = 0
+        # In submission order, so the totals are added up the same way on every run
+        for future in futures:
+            worker_stats = future.result()
+            rounds += worker_stats.rounds
+            nodes += worker_stats.nodes
+            for move, (wins, rollouts) in worker_stats.move_stats.items():
+                total_wins, total_rollouts = stats.get(move, (0, 0))
+                stats[move] = (total_wins + wins, total_rollouts + rollouts)
+            ownership = None
+            if worker_stats.ownership is not None:
+                weighted = worker_stats.ownership * worker_stats.rounds
+                ownership_sum = weighted if ownership_sum is None else ownership_sum + weighted
+                ownership_rounds += worker_stats.rounds
+            if ownership_rounds:
+                ownership = ownership_sum / ownership_rounds
+            yield self._stats(dict(stats), rounds, nodes, start, ownership)
+
+    def _tree_parallel_search(self, root):
+        '''
+        Keeps one rollout per worker in flight. Every selected path carries a virtual loss
+        until its rollout comes back, when the virtual loss is swapped for the real result.
+        Results are backed up oldest first, waiting for it if need be, so the tree does not
+        depend on which worker happens to finish first.
+        '''
+        pool = self._pool()
+        start = time.monotonic()
+        next_report = start + self.report_interval
+        pending = {}
+        started = 0
+        finished = 0
+        nodes = 1
+        while pending or self._within_budget(started, nodes, start):
+            while len(pending) < self.num_workers and self._within_budget(started, nodes, start):
+                path, expanded = self._select_path(root)
+                if expanded:
+                    nodes += 1
+                for node in path:
+                    node.add_virtual_loss()
+                job = (path[-1].game_state, self._rng.randrange(2 ** 31), self.collect_ownership)
+                pending[pool.submit(_playout_worker, job)] = path
+                started += 1
+            # pending keeps the order the rollouts were submitted in
+            future = next(iter(pending))
+            winner, ownership = future.result()
+            self._add_ownership(ownership)
+            for node in pending.pop(future):
+                node.remove_virtual_loss()
+                node.record_win(winner)
+            finished += 1
+            if pending and time.monotonic() >= next_report:
+                # Children with rollouts still in flight carry virtual losses, which only
+                # make the intermediate reports a little pessimistic
+                yield self._stats(self._root_stats(root), finished, nodes, start)
+                next_report = time.monotonic() + self.report_interval
+        yield self._stats(self._root_stats(root), finished, nodes, start)
+
     def select_child(self, node):
         '''
         1. Loop through the children of a node
         2. Calculate the UCT score of the child (see mcts_info for details)
-        3. Return the child with the best score 
+        3. Return the child with the best score
         '''
 
         total_rollouts = sum(child.num_rollouts for child in node.children)
@@ -109,12 +494,25 @@ class MCTSAgent(agent.Agent):
         return best_child
 
     @staticmethod
-    def simulate_random_game(game):
-        bots = {
-            Player.black: agent.RandomBot(),
-            Player.white: agent.RandomBot(),
-        }
-        while not game.is_over():
-            bot_move = bots[game.next_player].select_move(game)
-            game = game.apply_move(bot_move)
-        return game.winner()
\ No newline at end of file
+    def simulate_random_game(game, rng=random):
+        # A light playout on a private flat board: random moves that keep each side's eyes
+        return random_playout(game, rng).winner
+
+
+def _search_worker(job):
+    # Runs in a worker process for parallel='root': one independent, seeded tree search
+    game_state, temperature, seed, num_rounds, max_seconds, max_nodes, collect_ownership = job
+    bot = MCTSAgent(
+        num_rounds, temperature, seed=seed, max_seconds=max_seconds, max_nodes=max_nodes,
+        report_interval=float('inf'), collect_ownership=collect_ownership)
+    for stats in bot.search(game_state):
+        pass
+    return stats
+
+
+def _playout_worker(job):
+    # Runs in a worker process for parallel='tree': one seeded rollout, returning the winner
+    # and, if asked for, the ownership of the final board
+    game_state, seed, with_ownership = job
+    result = random_playout(game_state, random.Random(seed), with_ownership=with_ownership)
+    return result.winner, result.ownership
@@ -0,0 +1,125 @@
+import numpy as np
+
+from dlgo.agent.base import Agent
+from dlgo.goboard import Move
+
+__all__ = [
+    'PolicyAgent',
+    'ValueAgent',
+    'load_model',
+]
+
+def load_model(filename):
+    # keras is only imported here, so dlgo.agent works without it
+    from keras.models import load_model as keras_load_model
+    return keras_load_model(filename)
+
+
+class NeuralAgent(Agent):
+    '''
+    The parts PolicyAgent and ValueAgent share. model is anything with a Keras style
+    predict(x) (e.g. from load_model) and encoder any dlgo encoder (see
+    get_encoder_by_name) for the positions it was trained on. Encoded batches are reshaped
+    to model.input_shape when the model has one, moving the planes last if that is the
+    layout the model takes, so the models in extra_scripts can be used as they are saved.
+    Moves are only chosen from the game state's candidate_moves (legal plays that do not fill
+    one of the player's own eyes) and the agent passes when there are none.
+    With sample=True moves are drawn at random with the model's scores sharpened
+    (temperature < 1) or flattened (temperature > 1); otherwise the best one is taken.
+    '''
+    def __init__(self, model, encoder, sample=True, temperature=1.0, seed=None):
+        Agent.__init__(self)
+        self.model = model
+        self.encoder = encoder
+        self.sample = sample
+        self.temperature = temperature
+        self._rng = np.random.default_rng(seed)
+
+    def select_move(self, game_state):
+        return self.select_moves([game_state])[0]
+
+    def select_moves(self, game_states):
+        raise NotImplementedError()
+
+    def predict(self, game_states):
+        # Encodes the states and runs them through the model in one forward pass
+        features = self.encoder.encode_batch(game_states)
+        input_shape = getattr(self.model, 'input_shape', None)
+        if input_shape is not None:
+            input_shape = tuple(input_shape[1:])
+            num_planes, rows, cols = self.encoder.shape()
+            if num_planes > 1 and input_shape == (rows, cols, num_planes):
+                features = features.transpose(0, 2, 3, 1)
+            features = features.reshape((len(features),) + input_shape)
+        return np.asarray(self.model.predict(features, verbose=0))
+
+    def _candidate_points(self, game_state):
+        return [self.encoder.encode_point(move.point) for move in game_state.candidate_moves()]
+
+    def _choose(self, scores):
+        # Index of the chosen score, drawing in proportion to scores ** (1 / temperature)
+        if not self.sample:
+            return int(np.argmax(scores))
+        weights = np.power(np.clip(scores, 1e-6, None), 1.0 / self.temperature)
+        return int(self._rng.choice(len(weights), p=weights / weights.sum()))
+
+
+class PolicyAgent(NeuralAgent):
+    '''
+    Plays from a policy network: a model giving one probability per point, in the encoder's
+    point order, for the next move. The probabilities of the points that are not candidate
+    moves are dropped before sampling or taking the best one.
+    '''
+    def select_moves(self, game_states):
+        '''
+        Chooses a move for every game state with a single predict call, so many games can be
+        played side by side for the cost of one batch per turn.
+        '''
+        moves = [Move.pass_turn()] * len(game_states)
+        playing = [i for i, game_state in enumerate(game_states) if not game_state.is_over()]
+        if not playing:
+            return moves
+        probabilities = self.predict([game_states[i] for i in playing])
+        probabilities = probabilities.reshape(len(playing), -1)
+        for i, move_probabilities in zip(playing, probabilities):
+            points = self._candidate_points(game_states[i])
+            if points:
+                point = points[self._choose(move_probabilities[points])]
+                moves[i] = Move.play(self.encoder.decode_point_index(point))
+        return moves
+
+
+class ValueAgent(NeuralAgent):
+    '''
+    Plays from a value network: a model scoring a position for the player to move, higher
+    being better (a win probability or a -1 to 1 score). Every candidate move is played out
+    one step and the resulting positions are scored together; since the opponent is to move
+    in those, the move leaving them the lowest score is the best. Sampling draws in
+    proportion to 1 - score, which suits win probabilities.
+    '''
+    def select_moves(self, game_states):
+        '''
+        Chooses a move for every game state. The positions after every candidate move of
+        every game go through the model in a single predict call.
+        '''
+        moves = [Move.pass_turn()] * len(game_states)
+        candidates = []
+        next_states = []
+        for i, game_state in enumerate(game_states):
+            if game_state.is_over():
+                continue
+            for move in game_state.candidate_moves():
+                candidates.append((i, move))
+                next_states.append(game_state.apply_move(move))
+        if not next_states:
+            return moves
+        values = self.predict(next_states).reshape(len(next_states))
+        owners = np.array([i for i, _ in candidates])
+        for i in np.unique(owners):
+            options = np.flatnonzero(owners == i)
+            if self.sample:
+                choice = self._choose(1.0 - values[options])
+            else:
+                choice = int(np.argmin(values[options]))
+            moves[i] = candidates[options[choice]][1]
+        return moves
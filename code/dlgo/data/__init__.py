@@ -0,0 +1,5 @@
+from dlgo.data.shards import *
+from dlgo.data.dataset import *
+from dlgo.data.loader import *
+from dlgo.data.augment import *
+from dlgo.data.dedup import *
\ No newline at end of file
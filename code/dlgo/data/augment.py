@@ -0,0 +1,97 @@
+# Board symmetries for data augmentation. A Go position means the same after rotating or
+# reflecting the board, so each training sample can be shown to the network in any of the
+# 8 orientations of a square board (4 for a rectangular one) at no extra storage cost.
+
+import functools
+
+import numpy as np
+
+__all__ = [
+    'SymmetryAugmenter',
+    'num_symmetries',
+    'transform_labels',
+    'transform_planes',
+]
+
+# Symmetry k applies k % 4 quarter turns (k is 0 to 3), or a left-right reflection followed by
+# k % 4 quarter turns (k is 4 to 7). Quarter turns change the shape of a rectangular board, so
+# only 0, 2, 4 and 6 (identity, half turn and the two reflections) are used there.
+SQUARE_SYMMETRIES = tuple(range(8))
+RECTANGLE_SYMMETRIES = (0, 2, 4, 6)
+
+
+def num_symmetries(num_rows, num_cols):
+    return len(SQUARE_SYMMETRIES if num_rows == num_cols else RECTANGLE_SYMMETRIES)
+
+
+def transform_planes(planes, symmetry):
+    # Applies a symmetry to the last two axes (rows, cols) of an array of planes
+    if symmetry >= 4:
+        planes = planes[..., ::-1]
+    return np.rot90(planes, symmetry % 4, axes=(-2, -1))
+
+
+@functools.lru_cache(maxsize=None)
+def _label_maps(num_rows, num_cols):
+    '''
+    For every symmetry, the array that sends a point index (row * num_cols + col, as in
+    OnePlaneEncoder.encode_point) to where that point ends up. Worked out by transforming a
+    board of point indices and reading off where each index landed.
+    '''
+    board = np.arange(num_rows * num_cols).reshape(num_rows, num_cols)
+    maps = np.zeros((8, num_rows * num_cols), dtype=np.int64)
+    for symmetry in SQUARE_SYMMETRIES:
+        if num_rows != num_cols and symmetry not in RECTANGLE_SYMMETRIES:
+            continue
+        moved = transform_planes(board, symmetry).ravel()
+        maps[symmetry, moved] = np.arange(num_rows * num_cols)
+    return maps
+
+
+def transform_labels(labels, symmetry, num_rows, num_cols):
+    # Applies a symmetry to point index labels, or to rows of per-point targets
+    return _apply_label_map(np.asarray(labels), _label_maps(num_rows, num_cols)[symmetry])
+
+
+def _apply_label_map(labels, label_map, sparse=False):
+    if sparse:
+        # Policy points, with -1 in the unused slots
+        return np.where(labels >= 0, label_map[labels], labels).astype(labels.dtype)
+    if labels.ndim == 2:
+        targets = np.empty_like(labels)
+        targets[:, label_map] = labels
+        return targets
+    return label_map[labels].astype(labels.dtype)
+
+
+class SymmetryAugmenter(object):
+    '''
+    A BatchGenerator transform that gives every sample of a batch its own random symmetry.
+    The planes of all samples that share a symmetry are transformed together, so a batch
+    costs at most 8 array operations. Labels can be point indices [batch], per-point
+    targets [batch, num_points] or a sparse (points, counts) policy pair, and get the same
+    symmetry as their planes.
+    '''
+    def __init__(self, num_rows, num_cols, seed=None):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.symmetries = np.array(
+            SQUARE_SYMMETRIES if num_rows == num_cols else RECTANGLE_SYMMETRIES)
+        self._label_maps = _label_maps(num_rows, num_cols)
+        self._rng = np.random.default_rng(seed)
+
+    def __call__(self, features, labels):
+        chosen = self._rng.choice(self.symmetries, size=len(features))
+        sparse = isinstance(labels, tuple)
+        features = np.array(features)
+        points = np.array(labels[0] if sparse else labels)
+        for symmetry in np.unique(chosen):
+            if symmetry == 0:
+                continue
+            samples = chosen == symmetry
+            features[samples] = transform_planes(features[samples], symmetry)
+            points[samples] = _apply_label_map(
+                points[samples], self._label_maps[symmetry], sparse)
+        if sparse:
+            return features, (points, labels[1])
+        return features, points
@@ -0,0 +1,92 @@
+# Read-only views of training data that stay on disk. Arrays are opened with mmap_mode='r', so
+# a dataset can be far larger than memory and only the samples a batch asks for are read.
+
+import numpy as np
+
+from dlgo.data.shards import load_manifest, shard_path
+
+__all__ = [
+    'ArrayDataset',
+    'ShardedDataset',
+    'split_indices',
+]
+
+
+class ArrayDataset(object):
+    '''
+    A dataset made of named arrays with one entry per sample, for example
+    ArrayDataset.from_files(features='features-40k.npy', labels='labels-40k.npy').
+    '''
+    def __init__(self, **arrays):
+        lengths = set(len(array) for array in arrays.values())
+        if len(lengths) != 1:
+            raise ValueError('All arrays need one entry per sample, got lengths %s'
+                             % sorted(lengths))
+        self.arrays = arrays
+        self._num_samples = lengths.pop()
+
+    @classmethod
+    def from_files(cls, **paths):
+        return cls(**{name: np.load(path, mmap_mode='r') for name, path in paths.items()})
+
+    def __len__(self):
+        return self._num_samples
+
+    def take(self, indices):
+        # {name: array} for the given sample indices, in that order
+        indices = np.asarray(indices, dtype=np.int64)
+        return {name: np.asarray(array[indices]) for name, array in self.arrays.items()}
+
+
+class ShardedDataset(object):
+    '''
+    The shards written by a ShardWriter, seen as one dataset: sample i is found by looking up
+    which shard covers it, so nothing is copied or concatenated when the dataset is opened.
+    '''
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest = load_manifest(directory)
+        self.metadata = self.manifest['metadata']
+        shards = self.manifest['shards']
+        self.arrays = {
+            name: [np.load(shard_path(directory, shard['name'], name), mmap_mode='r')
+                   for shard in shards]
+            for name in self.manifest['arrays']
+        }
+        sizes = np.array([shard['num_samples'] for shard in shards], dtype=np.int64)
+        self._ends = np.cumsum(sizes)
+        self._starts = self._ends - sizes
+
+    def __len__(self):
+        return int(self._ends[-1]) if len(self._ends) else 0
+
+    def shard_start(self, shard_id):
+        # The index of the first sample of a shard
+        return int(self._starts[shard_id])
+
+    def take(self, indices):
+        # {name: array} for the given sample indices, in that order, reading shard by shard
+        indices = np.asarray(indices, dtype=np.int64)
+        shard_ids = np.searchsorted(self._ends, indices, side='right')
+        result = {}
+        for name, spec in self.manifest['arrays'].items():
+            result[name] = np.empty((len(indices),) + tuple(spec['shape']), dtype=spec['dtype'])
+        for shard_id in np.unique(shard_ids):
+            in_shard = shard_ids == shard_id
+            local = indices[in_shard] - self._starts[shard_id]
+            for name, shards in self.arrays.items():
+                result[name][in_shard] = shards[shard_id][local]
+        return result
+
+
+def split_indices(num_samples, test_fraction=0.1, shuffle=False, seed=None):
+    '''
+    Splits the sample indices into (train, test) index arrays without touching the data.
+    By default the last test_fraction of the samples is held out, which keeps whole games
+    together everywhere except at the cut; shuffle=True draws the test samples at random.
+    '''
+    indices = np.arange(num_samples, dtype=np.int64)
+    if shuffle:
+        np.random.default_rng(seed).shuffle(indices)
+    num_train = num_samples - int(round(num_samples * test_fraction))
+    return indices[:num_train], indices[num_train:]
@@ -0,0 +1,222 @@
+# Merges repeated positions in a sharded dataset. Self-play at low search budgets reaches the
+# same positions over and over; instead of keeping one row per occurrence, every distinct
+# position is kept once with the moves played from it counted into a policy target.
+
+import os
+
+import numpy as np
+
+from dlgo import zobrist
+from dlgo.data.augment import RECTANGLE_SYMMETRIES, SQUARE_SYMMETRIES, _label_maps, \
+    transform_planes
+from dlgo.data.dataset import ShardedDataset
+from dlgo.data.shards import ShardWriter
+from dlgo.gotypes import Player
+
+__all__ = [
+    'PositionIndex',
+    'board_hashes',
+    'deduplicate',
+    'position_keys',
+]
+
+INDEX_KEYS = 'index_keys.npy'
+INDEX_ROWS = 'index_rows.npy'
+
+
+def board_hashes(stones, num_rows, num_cols):
+    '''
+    The zobrist hash of each board in a stack of int8 stone arrays [N, rows, cols]
+    (0 empty, 1 black, 2 white), computed for the whole stack at once. It is the same value
+    Board.zobrist_hash() gives for that position.
+    '''
+    codes = np.frombuffer(zobrist.hash_table(num_rows, num_cols).stones, dtype=np.int64)
+    codes = np.concatenate([[0], codes]).reshape(-1)
+    points = np.arange(num_rows * num_cols) * 2
+    flat = stones.reshape(len(stones), -1).astype(np.int64)
+    # Index 0 of codes is the empty code; a stone of colour c at point p is at 1 + 2p + c - 1
+    selected = codes[np.where(flat > 0, points + flat, 0)]
+    return np.bitwise_xor.reduce(selected, axis=1)
+
+
+def position_keys(stones, players, num_rows, num_cols):
+    # Board hashes with the side to move folded in, as ZobristTable.key does
+    table = zobrist.hash_table(num_rows, num_cols)
+    hashes = board_hashes(stones, num_rows, num_cols)
+    return np.where(players == Player.white.value, hashes ^ table.side_to_move, hashes)
+
+
+def _stones_from_planes(features, players):
+    # Undoes the oneplane encoding: +1 is the player to move, -1 the opponent
+    plane = features[:, 0]
+    to_move = players.astype(np.int8)[:, np.newaxis, np.newaxis]
+    return np.where(plane > 0, to_move, np.where(plane < 0, 3 - to_move, 0)).astype(np.int8)
+
+
+def _canonical_keys(stones, players, num_rows, num_cols):
+    # The smallest key over the symmetries of each board, and the symmetry that gives it
+    symmetries = SQUARE_SYMMETRIES if num_rows == num_cols else RECTANGLE_SYMMETRIES
+    keys = None
+    chosen = np.zeros(len(stones), dtype=np.int8)
+    for symmetry in symmetries:
+        symmetry_keys = position_keys(
+            transform_planes(stones, symmetry), players, num_rows, num_cols)
+        if keys is None:
+            keys = symmetry_keys
+            continue
+        smaller = symmetry_keys < keys
+        keys = np.where(smaller, symmetry_keys, keys)
+        chosen[smaller] = symmetry
+    return keys, chosen
+
+
+def _sample_moves(dataset, shard_id):
+    # The moves recorded for each sample of a shard as (points, counts), both [n, width]
+    arrays = dataset.arrays
+    if 'policy_points' in arrays:
+        return np.asarray(arrays['policy_points'][shard_id]), \
+            np.asarray(arrays['policy_counts'][shard_id])
+    labels = np.asarray(arrays['labels'][shard_id])
+    if labels.ndim == 2:
+        labels = labels.argmax(axis=1)
+    return labels[:, np.newaxis].astype(np.int16), np.ones((len(labels), 1), dtype=np.float32)
+
+
+def deduplicate(source, destination, canonical=False, policy_width=None, shard_size=4096):
+    '''
+    Writes the distinct positions of the dataset in source to a new dataset in destination.
+    Positions are keyed by zobrist hash and side to move (and with canonical=True by the
+    smallest key over the board symmetries, so rotated and reflected copies count as one).
+    1. Stream over the shards, working out the key of every sample and the moves played
+        from it (a label counts once, a stored policy with its counts)
+    2. Group the keys, and add up the move counts of each position; each position keeps
+        its policy_width most played moves (by default every point, so nothing is dropped)
+    3. Stream over the shards again, writing the first occurrence of every position (turned
+        to the canonical symmetry if asked) with its merged policy_points/policy_counts, and
+        the mean of its values if the source has them
+    Only the keys and the merged counts are held in memory, not the samples. The sorted keys
+    and their rows are saved next to the new shards as an index (see PositionIndex), once
+    every shard has been written.
+    Running it again into the same destination resumes it: the source shards already written
+    (they are the writer's completed games) are skipped, so no position is written twice.
+    The source has to hold oneplane features and the players array.
+    '''
+    dataset = ShardedDataset(source)
+    if dataset.metadata.get('encoder') != 'oneplane' or 'players' not in dataset.arrays:
+        raise ValueError('%s needs oneplane features and players to be deduplicated' % source)
+    num_rows, num_cols = dataset.manifest['arrays']['features']['shape'][-2:]
+    num_points = num_rows * num_cols
+    if policy_width is None:
+        policy_width = num_points
+    label_maps = _label_maps(num_rows, num_cols)
+
+    has_values = 'values' in dataset.arrays
+    keys = []
+    symmetries = []
+    values = []
+    move_samples = []
+    move_points = []
+    move_counts = []
+    offset = 0
+    for shard_id in range(len(dataset.manifest['shards'])):
+        features = np.asarray(dataset.arrays['features'][shard_id])
+        players = np.asarray(dataset.arrays['players'][shard_id])
+        stones = _stones_from_planes(features, players)
+        points, counts = _sample_moves(dataset, shard_id)
+        if canonical:
+            shard_keys, shard_symmetries = _canonical_keys(stones, players, num_rows, num_cols)
+            points = np.where(
+                points >= 0, label_maps[shard_symmetries[:, np.newaxis], points], points)
+        else:
+            shard_keys = position_keys(stones, players, num_rows, num_cols)
+            shard_symmetries = np.zeros(len(stones), dtype=np.int8)
+        keys.append(shard_keys)
+        symmetries.append(shard_symmetries)
+        if has_values:
+            values.append(np.asarray(dataset.arrays['values'][shard_id], dtype=np.float64))
+        valid = points >= 0
+        move_samples.append(np.nonzero(valid)[0] + offset)
+        move_points.append(points[valid])
+        move_counts.append(counts[valid])
+        offset += len(stones)
+
+    keys = np.concatenate(keys)
+    symmetries = np.concatenate(symmetries)
+    unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    # Positions get rows in the order they first appear, which is the order pass 3 writes them
+    row_of_key = np.empty(len(unique_keys), dtype=np.int64)
+    row_of_key[np.argsort(first)] = np.arange(len(unique_keys))
+    sample_rows = row_of_key[inverse]
+    policy_points, policy_counts = _merge_moves(
+        sample_rows[np.concatenate(move_samples)], np.concatenate(move_points),
+        np.concatenate(move_counts), len(unique_keys), num_points, policy_width)
+    if has_values:
+        occurrences = np.bincount(sample_rows, minlength=len(unique_keys))
+        mean_values = (np.bincount(sample_rows, weights=np.concatenate(values),
+                                   minlength=len(unique_keys)) / occurrences).astype(np.float32)
+
+    is_first = np.zeros(len(keys), dtype=bool)
+    is_first[first] = True
+    metadata = dict(dataset.metadata, deduplicated_from=source, canonical=canonical,
+                    policy_width=policy_width)
+    with ShardWriter(destination, shard_size=shard_size, metadata=metadata) as writer:
+        for shard_id, shard in enumerate(dataset.manifest['shards']):
+            if shard_id in writer.completed_games:
+                continue
+            start = dataset.shard_start(shard_id)
+            keep = np.nonzero(is_first[start:start + shard['num_samples']])[0]
+            features = np.asarray(dataset.arrays['features'][shard_id][keep])
+            for symmetry in np.unique(symmetries[start + keep]):
+                samples = symmetries[start + keep] == symmetry
+                features[samples] = transform_planes(features[samples], symmetry)
+            rows = sample_rows[start + keep]
+            arrays = {
+                'features': features,
+                'players': np.asarray(dataset.arrays['players'][shard_id][keep]),
+                'policy_points': policy_points[rows],
+                'policy_counts': policy_counts[rows],
+            }
+            if has_values:
+                arrays['values'] = mean_values[rows]
+            writer.add_game(shard_id, **arrays)
+    np.save(os.path.join(destination, INDEX_KEYS), unique_keys)
+    np.save(os.path.join(destination, INDEX_ROWS), row_of_key)
+    return len(unique_keys)
+
+
+def _merge_moves(rows, points, counts, num_rows, num_points, width):
+    '''
+    Adds up the counts of every (row, point) pair and keeps the width largest of each row,
+    as [num_rows, width] arrays of points (-1 for unused slots) and counts.
+    '''
+    pairs, pair_index = np.unique(rows * num_points + points, return_inverse=True)
+    totals = np.bincount(pair_index, weights=counts).astype(np.float32)
+    pair_rows = pairs // num_points
+    # Largest counts first within each row
+    order = np.lexsort((-totals, pair_rows))
+    pair_rows = pair_rows[order]
+    row_starts = np.searchsorted(pair_rows, np.arange(num_rows))
+    rank = np.arange(len(order)) - row_starts[pair_rows]
+    kept = rank < width
+    merged_points = np.full((num_rows, width), -1, dtype=np.int16)
+    merged_counts = np.zeros((num_rows, width), dtype=np.float32)
+    merged_points[pair_rows[kept], rank[kept]] = (pairs[order] % num_points)[kept]
+    merged_counts[pair_rows[kept], rank[kept]] = totals[order][kept]
+    return merged_points, merged_counts
+
+
+class PositionIndex(object):
+    # The on-disk index of a deduplicated dataset: sorted keys and the row of each one
+    def __init__(self, directory):
+        self.keys = np.load(os.path.join(directory, INDEX_KEYS), mmap_mode='r')
+        self.rows = np.load(os.path.join(directory, INDEX_ROWS), mmap_mode='r')
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, keys):
+        # The dataset row of every key, or -1 where the position is not in the dataset
+        keys = np.asarray(keys, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        found = np.asarray(self.keys[positions]) == keys
+        return np.where(found, np.asarray(self.rows[positions]), -1)
@@ -0,0 +1,213 @@
+# Batch loading for training. Labels are stored as int16 point indices (see
+# Encoder.encode_point) and only expanded into training targets one batch at a time.
+
+import math
+import queue
+import threading
+
+import numpy as np
+
+__all__ = [
+    'BatchGenerator',
+    'expand_labels',
+    'expand_policy',
+    'iterate_batches',
+    'num_batches',
+]
+
+
+def expand_labels(labels, num_points, target='one_hot', dtype=np.float32):
+    '''
+    Turns a batch of point indices into training targets:
+    target='one_hot' --> [batch, num_points] with a 1 at each label, for categorical losses
+    target='sparse' --> [batch] of int32 indices, for sparse categorical losses
+    target='policy' --> labels is a (points, counts) pair of [batch, width] arrays, as the
+        dedup stage and the visit counts of self-play store them (-1 marks an unused slot);
+        each row becomes a distribution over [num_points] in proportion to the counts
+    Labels from older datasets that are already one-hot rows are accepted as well.
+    '''
+    if target == 'policy':
+        return expand_policy(labels[0], labels[1], num_points, dtype)
+    labels = np.asarray(labels)
+    if labels.ndim == 2:
+        if target == 'one_hot':
+            return labels.astype(dtype, copy=False)
+        labels = labels.argmax(axis=1)
+    if target == 'sparse':
+        return labels.astype(np.int32)
+    if target != 'one_hot':
+        raise ValueError('Unknown target %r' % (target,))
+    targets = np.zeros((len(labels), num_points), dtype=dtype)
+    targets[np.arange(len(labels)), labels] = 1
+    return targets
+
+
+def expand_policy(points, counts, num_points, dtype=np.float32):
+    points = np.asarray(points)
+    counts = np.asarray(counts, dtype=dtype)
+    targets = np.zeros((len(points), num_points), dtype=dtype)
+    rows, slots = np.nonzero(points >= 0)
+    np.add.at(targets, (rows, points[rows, slots]), counts[rows, slots])
+    totals = targets.sum(axis=1, keepdims=True)
+    np.divide(targets, totals, out=targets, where=totals > 0)
+    return targets
+
+
+def num_batches(num_samples, batch_size):
+    return math.ceil(num_samples / batch_size)
+
+
+def iterate_batches(features, labels, batch_size, num_points, target='one_hot', start=0,
+                    stop=None, repeat=False):
+    '''
+    Yields (features, targets) batches for samples start to stop, expanding the labels with
+    expand_labels as each batch is made. features and labels can be memory mapped
+    (np.load(..., mmap_mode='r')), so only one batch is ever read into memory. With
+    repeat=True it starts over after the last batch, as keras' fit() expects of a generator.
+    '''
+    if stop is None:
+        stop = len(labels)
+    while True:
+        for batch_start in range(start, stop, batch_size):
+            batch_stop = min(batch_start + batch_size, stop)
+            yield (np.asarray(features[batch_start:batch_stop]),
+                   expand_labels(labels[batch_start:batch_stop], num_points, target))
+        if not repeat:
+            return
+
+
+class BatchGenerator(object):
+    '''
+    Shuffled mini-batches of (features, targets) from a dataset (ArrayDataset or
+    ShardedDataset), restricted to the given sample indices such as one side of
+    split_indices. Each epoch visits the indices in a new random order; the samples of a
+    batch are read in index order, which keeps reads from memory mapped shards local.
+
+    transform, if given, is called as transform(features, labels) on the raw batch (labels
+    still point indices) and returns new ones; it runs before the labels are expanded.
+    With target='policy' the labels are read from the policy_points and policy_counts arrays
+    and handed around as a (points, counts) pair.
+    Batches for iteration are made on a background thread, up to prefetch batches ahead,
+    so reading and expanding overlap with training. keras_sequence() wraps the generator
+    for keras, which then does its own prefetching.
+    '''
+    def __init__(self, dataset, indices, batch_size, num_points, target='one_hot', shuffle=True,
+                 seed=None, transform=None, prefetch=2, features='features', labels='labels'):
+        self.dataset = dataset
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.batch_size = batch_size
+        self.num_points = num_points
+        self.target = target
+        self.shuffle = shuffle
+        self.transform = transform
+        self.prefetch = prefetch
+        self.features = features
+        if target == 'policy' and labels == 'labels':
+            labels = ('policy_points', 'policy_counts')
+        self.labels = labels
+        self._rng = np.random.default_rng(seed)
+        self._order = self.indices
+        self.on_epoch_end()
+
+    def __len__(self):
+        return num_batches(len(self.indices), self.batch_size)
+
+    def on_epoch_end(self):
+        # Draws the order of the next epoch
+        if self.shuffle:
+            self._order = self._rng.permutation(self.indices)
+
+    def batch(self, i):
+        # Batch i of the current epoch
+        batch_indices = np.sort(self._order[i * self.batch_size:(i + 1) * self.batch_size])
+        samples = self.dataset.take(batch_indices)
+        features = samples[self.features]
+        if isinstance(self.labels, tuple):
+            labels = tuple(samples[name] for name in self.labels)
+        else:
+            labels = samples[self.labels]
+        if self.transform is not None:
+            features, labels = self.transform(features, labels)
+        return features, expand_labels(labels, self.num_points, self.target)
+
+    def __iter__(self):
+        # One epoch, with the batches made ahead of time on a background thread
+        return _prefetch(self._epoch(), self.prefetch)
+
+    def _epoch(self):
+        for i in range(len(self)):
+            yield self.batch(i)
+        self.on_epoch_end()
+
+    def generate(self):
+        # Batches forever, one epoch after another, as keras' fit() expects of a generator
+        while True:
+            yield from self
+
+    def keras_sequence(self, **kwargs):
+        # keras is only imported here, so the rest of dlgo.data works without it. Keyword
+        # arguments (such as workers) go to the Sequence base class.
+        from keras.utils import Sequence
+
+        generator = self
+
+        class _BatchSequence(Sequence):
+            def __init__(self):
+                Sequence.__init__(self, **kwargs)
+
+            def __len__(self):
+                return len(generator)
+
+            def __getitem__(self, i):
+                return generator.batch(i)
+
+            def on_epoch_end(self):
+                generator.on_epoch_end()
+
+        return _BatchSequence()
+
+
+_DONE = object()
+
+def _prefetch(iterable, size):
+    '''
+    Runs an iterator on a background thread and yields its items, keeping up to size of
+    them ready. An exception in the thread is raised here; stopping early ends the thread.
+    '''
+    if size <= 0:
+        yield from iterable
+        return
+    items = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(entry):
+        # Waits for room in the queue, giving up if the consumer has gone away
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except Exception as e:
+            put((_DONE, e))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
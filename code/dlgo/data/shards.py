@@ -0,0 +1,148 @@
+# Streaming storage for generated training data: samples are appended game by game to numbered
+# shards of plain .npy files, and a manifest records which shards and games are complete, so a
+# run that stops part way can carry on where it left off.
+
+import json
+import os
+
+import numpy as np
+
+__all__ = [
+    'ShardWriter',
+    'load_manifest',
+]
+
+MANIFEST = 'manifest.json'
+
+
+def load_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as f:
+        return json.load(f)
+
+
+def shard_path(directory, shard_name, array_name):
+    return os.path.join(directory, '%s.%s.npy' % (shard_name, array_name))
+
+
+class ShardWriter(object):
+    '''
+    Writes named sample arrays (for example features and labels) into shards of about
+    shard_size samples. Every array given to add_game has one entry per sample, and a shard
+    is only cut between games, so each shard holds whole games: a shard called shard-00003
+    is stored as shard-00003.features.npy, shard-00003.labels.npy and so on.
+
+    manifest.json lists the finished shards with their sample and game counts, the dtype and
+    per-sample shape of every array, the ids of the games written so far and any metadata
+    passed in (board size, encoder name, ...). Shards are written before the manifest
+    mentions them, so after a crash the manifest still describes a consistent dataset.
+    Opening a directory that already has a manifest resumes it: completed_games says which
+    games to skip, and the games that were only buffered have to be played again.
+    '''
+    def __init__(self, directory, shard_size=4096, metadata=None):
+        self.directory = directory
+        self.shard_size = shard_size
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, MANIFEST)):
+            self.manifest = load_manifest(directory)
+            if metadata is not None and self.manifest['metadata'] != metadata:
+                raise ValueError(
+                    'Cannot resume %s: it was written with %r, not %r'
+                    % (directory, self.manifest['metadata'], metadata))
+            self._remove_unlisted_files()
+        else:
+            self.manifest = {
+                'metadata': metadata or {},
+                'arrays': {},
+                'shards': [],
+                'games': [],
+            }
+        self.completed_games = set(self.manifest['games'])
+        self._buffers = {}
+        self._buffered_samples = 0
+        self._buffered_games = []
+
+    @property
+    def num_samples(self):
+        # Samples in finished shards
+        return sum(shard['num_samples'] for shard in self.manifest['shards'])
+
+    def add_game(self, game_id=None, **arrays):
+        '''
+        Buffers the samples of one game and writes a shard once shard_size samples are
+        waiting. game_id defaults to the number of games added so far.
+        '''
+        if game_id is None:
+            game_id = len(self.completed_games) + len(self._buffered_games)
+        lengths = set(len(array) for array in arrays.values())
+        if len(lengths) > 1:
+            raise ValueError('All arrays of a game need one entry per sample, got lengths %s'
+                             % sorted(lengths))
+        num_samples = lengths.pop() if lengths else 0
+        if num_samples > 0:
+            self._check_arrays(arrays)
+            for name, array in arrays.items():
+                self._buffers.setdefault(name, []).append(np.asarray(array))
+            self._buffered_samples += num_samples
+        self._buffered_games.append(game_id)
+        if self._buffered_samples >= self.shard_size:
+            self.flush()
+
+    def _check_arrays(self, arrays):
+        # The first game fixes the names, dtypes and sample shapes; later games have to match
+        specs = {
+            name: {'dtype': np.asarray(array).dtype.str, 'shape': list(np.shape(array)[1:])}
+            for name, array in arrays.items()
+        }
+        if not self.manifest['arrays']:
+            self.manifest['arrays'] = specs
+        elif specs != self.manifest['arrays']:
+            raise ValueError('Expected arrays %r, got %r' % (self.manifest['arrays'], specs))
+
+    def flush(self):
+        # Writes everything buffered as one shard (games without samples only go in the manifest)
+        if not self._buffered_games:
+            return
+        if self._buffered_samples > 0:
+            shard_name = 'shard-%05d' % len(self.manifest['shards'])
+            for name, parts in self._buffers.items():
+                path = shard_path(self.directory, shard_name, name)
+                with open(path + '.tmp', 'wb') as f:
+                    np.save(f, np.concatenate(parts))
+                os.replace(path + '.tmp', path)
+            self.manifest['shards'].append({
+                'name': shard_name,
+                'num_samples': self._buffered_samples,
+                'num_games': len(self._buffered_games),
+            })
+        self.manifest['games'].extend(self._buffered_games)
+        self._write_manifest()
+        self.completed_games.update(self._buffered_games)
+        self._buffers = {}
+        self._buffered_samples = 0
+        self._buffered_games = []
+
+    def _write_manifest(self):
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(path + '.tmp', path)
+
+    def _remove_unlisted_files(self):
+        # Shards written after the last manifest update would otherwise be overwritten half way
+        listed = set(
+            os.path.basename(shard_path(self.directory, shard['name'], name))
+            for shard in self.manifest['shards']
+            for name in self.manifest['arrays'])
+        for filename in os.listdir(self.directory):
+            if filename.startswith('shard-') and filename not in listed:
+                os.remove(os.path.join(self.directory, filename))
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # Whole games are buffered, so even after an error the buffer is safe to write out
+        self.close()
@@ -1,2 +1,5 @@
 from dlgo.encoders.base import *
-from dlgo.encoders.oneplane import *
\ No newline at end of file
+from dlgo.encoders.oneplane import *
+from dlgo.encoders.liberties import *
+from dlgo.encoders.legalmoves import *
+from dlgo.encoders.movehistory import *
\ No newline at end of file
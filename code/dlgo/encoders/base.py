@@ -1,6 +1,11 @@
 import importlib
 
+import numpy as np
+
+from dlgo.goboard import Point
+
 __all__ = [
+    'BoardEncoder',
     'Encoder',
     'get_encoder_by_name',
 ]
@@ -12,6 +17,14 @@ class Encoder:
     def encode(self, game_state):
         raise NotImplementedError()
 
+    def encode_batch(self, game_states, out=None):
+        # Stacks encode() for every state; encoders override this with a vectorised version
+        if out is None:
+            out = np.empty((len(game_states),) + self.shape(), dtype=getattr(self, 'dtype', None))
+        for i, game_state in enumerate(game_states):
+            out[i] = self.encode(game_state)
+        return out
+
     def encode_point(self, point):
         raise NotImplementedError()
 
@@ -24,9 +37,31 @@ class Encoder:
     def shape(self):
         raise NotImplementedError()
 
-def get_encoder_by_name(name, board_size):
+class BoardEncoder(Encoder):
+    '''
+    An encoder with num_planes planes over the whole board, whose points are numbered row by
+    row. Subclasses set board_width, board_height and num_planes.
+    '''
+    def encode_point(self, point):
+        # Encodes a single point into a vector that has length (width*height)
+        return self.board_width * (point.row - 1) + (point.col - 1)
+
+    def decode_point_index(self, index):
+        # Decodes a point from a vector into its row, col position on the board
+        row = index // self.board_width
+        col = index % self.board_width
+        return Point(row=row + 1, col=col + 1)
+
+    def num_points(self):
+        return self.board_width * self.board_height
+
+    def shape(self):
+        return self.num_planes, self.board_height, self.board_width
+
+def get_encoder_by_name(name, board_size, **kwargs):
+    # Any keyword arguments (such as dtype) are passed on to the encoder's create function
     if isinstance(board_size, int):
         board_size = (board_size, board_size)
     module = importlib.import_module('dlgo.encoders.' + name)
     constructor = getattr(module, 'create')
-    return constructor(board_size)
\ No newline at end of file
+    return constructor(board_size, **kwargs)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import numpy as np
+
+from dlgo import zobrist
+from dlgo.encoders.base import BoardEncoder
+from dlgo.goboard import Move, Point
+from dlgo.scoring import board_to_array
+
+__all__ = [
+    'LegalMovesEncoder',
+]
+
+class LegalMovesEncoder(BoardEncoder):
+    '''
+    Three planes:
+    plane 0 --> the next player's stones
+    plane 1 --> the opponent's stones
+    plane 2 --> 1 on every point where the next player may legally play
+    A point is legal when it is empty and the stone would have a liberty: an empty neighbour,
+    a friendly neighbour with a liberty to spare, or an opponent neighbour in atari that it
+    captures. That is worked out for the whole board from the stones and liberty_array().
+    The points left are then checked against the game's superko history (see
+    superko_points), as GameState.does_move_violate_ko does.
+    '''
+    def __init__(self, board_size, dtype=np.float64):
+        self.board_width, self.board_height = board_size
+        self.num_planes = 3
+        self.dtype = np.dtype(dtype)
+
+    def name(self):
+        return 'legalmoves'
+
+    def encode(self, game_state, out=None):
+        if out is None:
+            out = np.empty(self.shape(), dtype=self.dtype)
+        board = game_state.board
+        stones = board_to_array(board)
+        player = game_state.next_player
+        out[0] = stones == player.value
+        out[1] = stones == player.other.value
+        if game_state.is_over():
+            out[2] = 0
+            return out
+        legal, captures = legal_points(
+            stones, board.liberty_array(), player.value, player.other.value)
+        out[2] = legal & ~superko_points(game_state, legal, captures)
+        return out
+
+def legal_points(stones, liberties, own, opponent):
+    '''
+    Returns two boolean arrays shaped like stones: the empty points where own can play
+    without suicide (ko aside), and the ones among them that capture something.
+    '''
+    has_liberty = np.zeros(stones.shape, dtype=bool)
+    captures = np.zeros(stones.shape, dtype=bool)
+    # For each direction, the points that have a neighbour that way and those neighbours
+    for here, there in _NEIGHBOUR_SLICES:
+        neighbour = stones[there]
+        neighbour_liberties = liberties[there]
+        has_liberty[here] |= (neighbour == 0) | ((neighbour == own) & (neighbour_liberties > 1))
+        captures[here] |= (neighbour == opponent) & (neighbour_liberties == 1)
+    empty = stones == 0
+    captures &= empty
+    return empty & (has_liberty | captures), captures
+
+def superko_points(game_state, points, captures):
+    '''
+    Returns a boolean array marking the points (a boolean array of empty points, as from
+    legal_points) where a stone of the next player would repeat an earlier position.
+    Capturing points go through does_move_violate_ko. For the others the new hash is the
+    board hash xor the stone's code, so each one costs a single lookup in the history: in
+    longer cycles than a simple ko the repeating move need not capture anything.
+    '''
+    board = game_state.board
+    player = game_state.next_player
+    repeats = np.zeros(points.shape, dtype=bool)
+    for row, col in np.argwhere(points & captures):
+        if game_state.does_move_violate_ko(player, Move.play(Point(row=row + 1, col=col + 1))):
+            repeats[row, col] = True
+
+    # The table holds a black and a white code per point, in row-major order
+    table = zobrist.hash_table(board.num_rows, board.num_cols)
+    codes = np.frombuffer(table.stones, dtype=np.int64)[player.value - 1::2]
+    codes = codes.reshape(points.shape)
+    quiet = points & ~captures
+    previous_states = game_state.previous_states
+    next_player = player.other
+    hashes = (board.zobrist_hash() ^ codes[quiet]).tolist()
+    for (row, col), next_hash in zip(np.argwhere(quiet), hashes):
+        if (next_player, next_hash) in previous_states:
+            repeats[row, col] = True
+    return repeats
+
+_NEIGHBOUR_SLICES = (
+    ((slice(1, None), slice(None)), (slice(None, -1), slice(None))),
+    ((slice(None, -1), slice(None)), (slice(1, None), slice(None))),
+    ((slice(None), slice(1, None)), (slice(None), slice(None, -1))),
+    ((slice(None), slice(None, -1)), (slice(None), slice(1, None))),
+)
+
+def create(board_size, **kwargs):
+    return LegalMovesEncoder(board_size, **kwargs)
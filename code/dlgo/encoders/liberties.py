@@ -0,0 +1,41 @@
+import numpy as np
+
+from dlgo.encoders.base import BoardEncoder
+from dlgo.scoring import board_to_array
+
+__all__ = [
+    'LibertyEncoder',
+]
+
+class LibertyEncoder(BoardEncoder):
+    '''
+    Eight planes of stones split by the liberties of their string:
+    planes 0-3 --> the next player's stones with 1, 2, 3 and 4 or more liberties
+    planes 4-7 --> the opponent's stones, the same way
+    The liberty counts come from the board's liberty_array(), which is built from the strings
+    the board already keeps, so no regions are flood filled here.
+    '''
+    def __init__(self, board_size, dtype=np.float64):
+        self.board_width, self.board_height = board_size
+        self.num_planes = 8
+        self.dtype = np.dtype(dtype)
+
+    def name(self):
+        return 'liberties'
+
+    def encode(self, game_state, out=None):
+        if out is None:
+            out = np.empty(self.shape(), dtype=self.dtype)
+        board = game_state.board
+        stones = board_to_array(board)
+        liberties = np.minimum(board.liberty_array(), 4)
+        own = stones == game_state.next_player.value
+        opponent = stones == game_state.next_player.other.value
+        for count in range(1, 5):
+            with_count = liberties == count
+            out[count - 1] = own & with_count
+            out[count + 3] = opponent & with_count
+        return out
+
+def create(board_size, **kwargs):
+    return LibertyEncoder(board_size, **kwargs)
@@ -0,0 +1,64 @@
+import numpy as np
+
+from dlgo.encoders.base import BoardEncoder
+from dlgo.encoders.legalmoves import legal_points, superko_points
+from dlgo.scoring import board_to_array
+
+__all__ = [
+    'MoveHistoryEncoder',
+]
+
+class MoveHistoryEncoder(BoardEncoder):
+    '''
+    3 + num_moves planes:
+    plane 0 --> the next player's stones
+    plane 1 --> the opponent's stones
+    plane 2 --> points the next player may not play because of ko
+    plane 3 + i --> the move played i moves ago (empty for a pass or before the game started)
+    Plane 2 marks the points that would be legal but repeat an earlier position, found as in
+    LegalMovesEncoder (see superko_points). The recent moves come from the chain of previous
+    states; a state advanced in place with GameState.play still knows its last two moves.
+    '''
+    def __init__(self, board_size, num_moves=4, dtype=np.float64):
+        self.board_width, self.board_height = board_size
+        self.num_moves = num_moves
+        self.num_planes = 3 + num_moves
+        self.dtype = np.dtype(dtype)
+
+    def name(self):
+        return 'movehistory'
+
+    def encode(self, game_state, out=None):
+        if out is None:
+            out = np.empty(self.shape(), dtype=self.dtype)
+        stones = board_to_array(game_state.board)
+        player = game_state.next_player
+        out[0] = stones == player.value
+        out[1] = stones == player.other.value
+        out[2:] = 0
+
+        if not game_state.is_over():
+            legal, captures = legal_points(
+                stones, game_state.board.liberty_array(), player.value, player.other.value)
+            out[2] = superko_points(game_state, legal, captures)
+
+        for i, move in enumerate(self._recent_moves(game_state)):
+            if move is not None and move.is_play:
+                out[3 + i, move.point.row - 1, move.point.col - 1] = 1
+        return out
+
+    def _recent_moves(self, game_state):
+        # The last num_moves moves, newest first, as far back as the game state can tell
+        moves = []
+        state = game_state
+        while state is not None and len(moves) < self.num_moves:
+            moves.append(state.last_move)
+            if state.previous_state is None:
+                if len(moves) < self.num_moves:
+                    moves.append(state.previous_move)
+                break
+            state = state.previous_state
+        return moves
+
+def create(board_size, **kwargs):
+    return MoveHistoryEncoder(board_size, **kwargs)
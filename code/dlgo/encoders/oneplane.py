@@ -1,46 +1,53 @@
 import numpy as np
 
-from dlgo.encoders.base import Encoder
-from dlgo.goboard import Point
-
-class OnePlaneEncoder(Encoder):
-    def __init__(self, board_size):
+from dlgo.encoders.base import BoardEncoder
+from dlgo.gotypes import Player
+from dlgo.scoring import board_to_array
+
+# Maps the stones of board_to_array (0 empty, 1 black, 2 white) to the plane for black to move;
+# the plane for white to move is the same with the sign flipped
+_BLACK_TO_MOVE = (0, 1, -1)
+
+class OnePlaneEncoder(BoardEncoder):
+    '''
+    One plane: 1 for the next player's stones, -1 for the opponent's and 0 for empty points.
+    Planes are built from the board's int8 array form in a couple of array operations,
+    in the given dtype (float64 by default, int8 or float32 for compact training data).
+    '''
+    def __init__(self, board_size, dtype=np.float64):
         self.board_width, self.board_height = board_size
         self.num_planes = 1
+        self.dtype = np.dtype(dtype)
+        self._lookup = np.array(_BLACK_TO_MOVE, dtype=self.dtype)
 
     def name(self):
         return 'oneplane'
 
-    def encode(self, game_state):
-        board_matrix = np.zeros(self.shape())
-        next_player = game_state.next_player
-        for r in range(self.board_height):
-            for c in range(self.board_width):
-                p = Point(row=r + 1, col=c + 1)
-                go_string = game_state.board.get_go_string(p)
-                if go_string is None:
-                    continue
-                if go_string.color == next_player:
-                    board_matrix[0, r, c] = 1
-                else:
-                    board_matrix[0, r, c] = -1
-        return board_matrix
-
-    def encode_point(self, point):
-        # Encodes a single point into a vector that has length (width*height)
-        return self.board_width * (point.row - 1) + (point.col - 1)
-
-    def decode_point_index(self, index):
-        # Decodes a point from a vector into its row, col position on the board
-        row = index // self.board_width
-        col = index % self.board_width
-        return Point(row=row + 1, col=col + 1)
-
-    def num_points(self):
-        return self.board_width * self.board_height
-
-    def shape(self):
-        return self.num_planes, self.board_height, self.board_width
-
-def create(board_size):
-    return OnePlaneEncoder(board_size)
\ No newline at end of file
+    def encode(self, game_state, out=None):
+        # Writes into out ([1, height, width] of this encoder's dtype) if it is given
+        if out is None:
+            out = np.empty(self.shape(), dtype=self.dtype)
+        stones = board_to_array(game_state.board)
+        np.take(self._lookup, stones, out=out[0])
+        if game_state.next_player == Player.white:
+            np.negative(out[0], out=out[0])
+        return out
+
+    def encode_batch(self, game_states, out=None):
+        '''
+        Encodes a list of game states into [len(game_states), 1, height, width], or into
+        the first len(game_states) entries of out.
+        '''
+        if out is None:
+            out = np.empty((len(game_states),) + self.shape(), dtype=self.dtype)
+        stones = np.stack([board_to_array(game_state.board) for game_state in game_states])
+        signs = np.array(
+            [1 if game_state.next_player == Player.black else -1 for game_state in game_states],
+            dtype=self.dtype)
+        planes = out[:len(game_states), 0]
+        np.take(self._lookup, stones, out=planes)
+        planes *= signs[:, np.newaxis, np.newaxis]
+        return out
+
+def create(board_size, **kwargs):
+    return OnePlaneEncoder(board_size, **kwargs)
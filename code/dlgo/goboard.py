@@ -1,4 +1,5 @@
 import copy
+import numpy as np
 from dlgo.gotypes import Point, Player
 from dlgo.scoring import compute_game_result
 from dlgo import zobrist
@@ -31,6 +32,15 @@ class Move():
             return 'resign'
         return '(r %d, c %d)' % (self.point.row, self.point.col)
 
+    def __eq__(self, other):
+        return isinstance(other, Move) and \
+            self.point == other.point and \
+            self.is_pass == other.is_pass and \
+            self.is_resign == other.is_resign
+
+    def __hash__(self):
+        return hash((self.point, self.is_pass, self.is_resign))
+
 
 
 class GoString():
@@ -82,7 +92,14 @@ class Board():
         self.num_rows = num_rows
         self.num_cols = num_cols
         self._grid = {}
+        self._zobrist = zobrist.hash_table(num_rows, num_cols)
         self._hash = zobrist.EMPTY_BOARD
+        self._undo_stack = []
+        # Kept up to date as stones are placed and captured, so nothing has to scan the grid
+        self._empty = set(
+            Point(row, col)
+            for row in range(1, num_rows + 1)
+            for col in range(1, num_cols + 1))
 
     def place_stone(self, player, point: Point):
         '''
@@ -119,8 +136,9 @@ class Board():
             new_string = new_string.merged_with(same_color_string)
         for new_string_point in new_string.stones:
             self._grid[new_string_point] = new_string
+        self._empty.discard(point)
 
-        self._hash ^= zobrist.HASH_CODE[point, player]
+        self._hash ^= self._zobrist.stone(point, player)
 
         for other_color_string in adjacent_opposite_color:
             replacement = other_color_string.without_liberty(point)
@@ -142,8 +160,121 @@ class Board():
                 if neighbour_string is not string:
                     self._replace_string(neighbour_string.with_liberty(point))
             self._grid[point] = None
+            self._empty.add(point)
+
+            self._hash ^= self._zobrist.stone(point, string.color)
+
+    def play(self, player, point: Point):
+        '''
+        Places a stone in place and remembers how to take it back with undo().
+        GoStrings are immutable, so it is enough to save the grid entries that place_stone
+        is going to overwrite:
+        1. The new point and every stone of the strings next to it (merged or losing a liberty)
+        2. For every string that will be captured, the stones of the strings around it,
+            since they are about to get their liberties back
+        '''
+        touched = {point}
+        for neighbour in point.neighbours():
+            neighbour_string = self._grid.get(neighbour)
+            if neighbour_string is None:
+                continue
+            touched |= neighbour_string.stones
+            if neighbour_string.color != player and neighbour_string.num_liberties == 1:
+                for stone in neighbour_string.stones:
+                    for stone_neighbour in stone.neighbours():
+                        string = self._grid.get(stone_neighbour)
+                        if string is not None:
+                            touched |= string.stones
+        saved = [(p, self._grid.get(p)) for p in touched]
+        self._undo_stack.append((saved, self._hash))
+        self.place_stone(player, point)
+
+    def undo(self):
+        # Takes back the last stone placed with play()
+        saved, previous_hash = self._undo_stack.pop()
+        for point, string in saved:
+            self._grid[point] = string
+            if string is None:
+                self._empty.add(point)
+            else:
+                self._empty.discard(point)
+        self._hash = previous_hash
+
+    def is_self_capture(self, player, point: Point):
+        '''
+        Works out whether placing a stone here would leave it without liberties, without
+        placing it. The move is fine if any neighbour is:
+        1. Empty --> the new stone has a liberty
+        2. A friendly string with another liberty --> the merged string keeps it
+        3. An enemy string in atari --> it gets captured, which frees a liberty
+        '''
+        for neighbour in point.neighbours():
+            if not self.is_on_grid(neighbour):
+                continue
+            neighbour_string = self._grid.get(neighbour)
+            if neighbour_string is None:
+                return False
+            if neighbour_string.color == player:
+                if neighbour_string.num_liberties > 1:
+                    return False
+            elif neighbour_string.num_liberties == 1:
+                return False
+        return True
 
-            self._hash ^= zobrist.HASH_CODE[point, string.color]
+    def hash_after_move(self, player, point: Point):
+        # The zobrist hash the board would have after placing a stone here, taking captures into account
+        new_hash = self._hash ^ self._zobrist.stone(point, player)
+        captured = []
+        for neighbour in point.neighbours():
+            neighbour_string = self._grid.get(neighbour)
+            if neighbour_string is None or neighbour_string.color == player:
+                continue
+            if neighbour_string.num_liberties == 1 and neighbour_string not in captured:
+                captured.append(neighbour_string)
+                for stone in neighbour_string.stones:
+                    new_hash ^= self._zobrist.stone(stone, neighbour_string.color)
+        return new_hash
+
+    def is_eye(self, point: Point, color):
+        '''
+        Same test as agent.helpers.is_point_an_eye: an empty point whose neighbours are all
+        friendly, with three of the four corners controlled (all of them on the edge).
+        '''
+        if self._grid.get(point) is not None:
+            return False
+        for neighbour in point.neighbours():
+            if self.is_on_grid(neighbour) and self.get(neighbour) != color:
+                return False
+        friendly_corners = 0
+        off_board_corners = 0
+        for corner in (
+                Point(point.row - 1, point.col - 1),
+                Point(point.row - 1, point.col + 1),
+                Point(point.row + 1, point.col - 1),
+                Point(point.row + 1, point.col + 1)):
+            if not self.is_on_grid(corner):
+                off_board_corners += 1
+            elif self.get(corner) == color:
+                friendly_corners += 1
+        if off_board_corners > 0:
+            return off_board_corners + friendly_corners == 4
+        return friendly_corners >= 3
+
+    def empty_points(self):
+        return list(self._empty)
+
+    def candidate_points(self, player):
+        '''
+        Returns (point, hash after the move) for every empty point where the player can
+        play without capturing itself or filling one of its own eyes. Ko depends on the
+        game history, so the caller checks the hashes against it.
+        '''
+        candidates = []
+        for point in self._empty:
+            if self.is_self_capture(player, point) or self.is_eye(point, player):
+                continue
+            candidates.append((point, self.hash_after_move(player, point)))
+        return candidates
 
     def is_on_grid(self, point: 'Point'):
         return 1 <= point.row <= self.num_rows \
@@ -156,6 +287,22 @@ class Board():
             return None
         return string.color
     
+    def as_array(self):
+        # The stones as an int8 array indexed [row - 1, col - 1]: 0 for empty, 1 for black, 2 for white
+        stones = np.zeros((self.num_rows, self.num_cols), dtype=np.int8)
+        for point, string in self._grid.items():
+            if string is not None:
+                stones[point.row - 1, point.col - 1] = string.color.value
+        return stones
+
+    def liberty_array(self):
+        # The liberty count of the string on every point as an int16 array like as_array (0 when empty)
+        liberties = np.zeros((self.num_rows, self.num_cols), dtype=np.int16)
+        for point, string in self._grid.items():
+            if string is not None:
+                liberties[point.row - 1, point.col - 1] = string.num_liberties
+        return liberties
+
     def get_go_string(self, point: 'Point'):
         # Returns the entire string of stones at a point --> GoString if there is a stone, otherwise None
         string = self._grid.get(point)
@@ -170,16 +317,114 @@ class Board():
             self._hash() == other._hash()
 
     def __deepcopy__(self, memodict={}):
-        copied = Board(self.num_rows, self.num_cols)
+        copied = Board.__new__(Board)
+        copied.num_rows = self.num_rows
+        copied.num_cols = self.num_cols
         # Can do a shallow copy because the dictionary maps tuples (immutable) to GoStrings (also immutable)
         copied._grid = copy.copy(self._grid)
+        copied._zobrist = self._zobrist
         copied._hash = self._hash
+        copied._undo_stack = []
+        copied._empty = set(self._empty)
         return copied
 
     def zobrist_hash(self):
         return self._hash
 
-    
+
+class _HistoryLine():
+    # A run of SituationHistory nodes where each one extended the previous one. depths maps
+    # every situation added on the run to the depth where it first appeared; base is the node
+    # the run branched off from (None for the run that starts at the empty history)
+    __slots__ = ('depths', 'tip', 'base')
+
+    def __init__(self, base):
+        self.depths = {}
+        self.tip = None
+        self.base = base
+
+
+# Bits in the bloom mask of a SituationHistory node: 512 bytes each, with few false hits
+# in games of a few hundred moves
+_BLOOM_BITS = 4096
+
+def _bloom_bit(situation):
+    next_player, board_hash = situation
+    return (board_hash ^ next_player.value) % _BLOOM_BITS
+
+
+class SituationHistory():
+    '''
+    The set of (next_player, zobrist hash) situations a game has been through, used for
+    positional superko. It is persistent: add() returns a new history that shares everything
+    with the old one, and both stay valid, so every GameState can keep its own without copying.
+    Nodes are linked to their parents. Extending the newest node of a line also reuses that
+    line's dict, so adding a situation is O(1) and a full membership test is one dict lookup
+    per branch point on the way back to the start of the game.
+    Searches branch off at almost every move, so that walk can be as long as the game. Each
+    node therefore also keeps a bloom mask, a Python int with one bit set per situation
+    (its parent's mask plus one bit), and a situation whose bit is not set is known to be
+    missing without walking at all.
+    '''
+    __slots__ = ('situation', 'parent', 'depth', 'mask', '_line')
+
+    def __init__(self):
+        self.situation = None
+        self.parent = None
+        self.depth = 0
+        self.mask = 0
+        self._line = _HistoryLine(None)
+        self._line.tip = self
+
+    def add(self, situation):
+        node = SituationHistory.__new__(SituationHistory)
+        node.situation = situation
+        node.parent = self
+        node.depth = self.depth + 1
+        node.mask = self.mask | (1 << _bloom_bit(situation))
+        line = self._line
+        if line.tip is not self:
+            # Someone has already extended this node, so branch off into a new line
+            line = _HistoryLine(self)
+        line.depths.setdefault(situation, node.depth)
+        line.tip = node
+        node._line = line
+        return node
+
+    def __contains__(self, situation):
+        if not (self.mask >> _bloom_bit(situation)) & 1:
+            return False
+        node = self
+        while node is not None:
+            line = node._line
+            depth = line.depths.get(situation)
+            # Entries deeper than this node were added by its descendants on the same line
+            if depth is not None and depth <= node.depth:
+                return True
+            node = line.base
+        return False
+
+    def __len__(self):
+        return self.depth
+
+    def __iter__(self):
+        # Newest situation first
+        node = self
+        while node.parent is not None:
+            yield node.situation
+            node = node.parent
+
+    def __reduce__(self):
+        # Pickled as a flat list, since the parent chain is too deep for the recursive pickler
+        return (_history_from_situations, (list(self)[::-1],))
+
+
+def _history_from_situations(situations):
+    history = SituationHistory()
+    for situation in situations:
+        history = history.add(situation)
+    return history
+
 
 
 
@@ -188,16 +433,17 @@ class GameState():
         self.board = board
         self.next_player = next_player
         self.previous_state = previous
-        # If there is no prior state, an empty state is created for previous_state
-        # Else, we update previous_states by creating a union (|) of sets between 
-        # (previous.previous_states) and a tuple of (next_player, zobrist_hash)
+        # If there is no prior state, previous_states starts out as an empty history
+        # Else, we extend previous.previous_states with a tuple of (next_player, zobrist_hash);
+        # the history is shared with the previous state rather than copied
         if self.previous_state is None:
-            self.previous_states = frozenset()
+            self.previous_states = SituationHistory()
         else:
-            self.previous_states = frozenset(
-                previous.previous_states |
-                {(previous.next_player, previous.board.zobrist_hash())})
+            self.previous_states = previous.previous_states.add(
+                (previous.next_player, previous.board.zobrist_hash()))
         self.last_move = move
+        self.previous_move = None if previous is None else previous.last_move
+        self._undo_stack = []
 
     def apply_move(self, move: Move):
         # Returns the GameState after applying the move
@@ -206,21 +452,63 @@ class GameState():
             next_board.place_stone(self.next_player, move.point)
         else:
             next_board = self.board
-        return GameState(next_board, self.next_player.other, self, move)
+        return self.__class__(next_board, self.next_player.other, self, move)
+
+    def play(self, move: Move):
+        '''
+        Applies the move to this GameState in place instead of building a new one, and
+        remembers enough to take it back with undo(). The board is changed in place too,
+        so only play on a state that owns its board (see copy()). States advanced in place
+        do not keep a previous_state.
+        '''
+        self._undo_stack.append(
+            (self.previous_state, self.previous_states, self.previous_move))
+        self.previous_states = self.previous_states.add(
+            (self.next_player, self.board.zobrist_hash()))
+        if move.is_play:
+            self.board.play(self.next_player, move.point)
+        self.previous_state = None
+        self.previous_move = self.last_move
+        self.last_move = move
+        self.next_player = self.next_player.other
+
+    def undo(self):
+        # Takes back the last move applied with play()
+        move = self.last_move
+        if move.is_play:
+            self.board.undo()
+        self.next_player = self.next_player.other
+        self.last_move = self.previous_move
+        self.previous_state, self.previous_states, self.previous_move = self._undo_stack.pop()
+
+    def __getstate__(self):
+        # Pickled states leave out the chain of previous states (the ko history and the previous
+        # move are kept), so sending a late game state to another process stays cheap
+        state = self.__dict__.copy()
+        state['previous_state'] = None
+        state['_undo_stack'] = []
+        return state
+
+    def copy(self):
+        # Returns a GameState with its own board and the same history, ready to be played on in place
+        copied = copy.copy(self)
+        copied.board = copy.deepcopy(self.board)
+        copied._undo_stack = []
+        return copied
     
     @classmethod
     def new_game(cls, board_size):
         if isinstance(board_size, int):
             board_size = (board_size, board_size)
         board = Board(*board_size)
-        return GameState(board, Player.black, None, None)
+        return cls(board, Player.black, None, None)
         
     def is_over(self):
         if self.last_move is None:
             return False # Occurs when there is a New Game
         if self.last_move.is_resign:
             return True
-        second_last_move = self.previous_state.last_move
+        second_last_move = self.previous_move
         if second_last_move is None:
             return False # Occurs when there is a New Game
         return self.last_move.is_pass and second_last_move.is_pass
@@ -228,10 +516,7 @@ class GameState():
     def is_move_self_capture(self, player, move):
         if not move.is_play:
             return False
-        next_board = copy.deepcopy(self.board)
-        next_board.place_stone(player, move.point)
-        new_string = next_board.get_go_string(move.point)
-        return new_string.num_liberties == 0
+        return self.board.is_self_capture(player, move.point)
     
     @property
     def situation(self):
@@ -240,9 +525,7 @@ class GameState():
     def does_move_violate_ko(self, player: Player, move: Move):
         if not move.is_play:
             return False
-        next_board = copy.deepcopy(self.board)
-        next_board.place_stone(player, move.point)
-        next_situation = (player.other, next_board.zobrist_hash())
+        next_situation = (player.other, self.board.hash_after_move(player, move.point))
         return next_situation in self.previous_states
     
     def is_valid_move(self, move: Move):
@@ -256,16 +539,30 @@ class GameState():
 
     def legal_moves(self):
         moves = []
-        for row in range(1, self.board.num_rows + 1):
-            for col in range(1, self.board.num_cols + 1):
-                move = Move.play(Point(row, col))
-                if self.is_valid_move(move):
-                    moves.append(move)
+        for point in self.board.empty_points():
+            move = Move.play(point)
+            if self.is_valid_move(move):
+                moves.append(move)
         moves.append(Move.pass_turn())
         moves.append(Move.resign())
 
         return moves
     
+    def candidate_moves(self):
+        '''
+        The moves worth considering in a random game: every legal play that does not fill
+        one of the next player's own eyes. Only the board's empty points are looked at, and
+        any point with an empty neighbour is settled by that neighbour, so the full suicide
+        and eye checks only run next to stones. Passing and resigning are left to the caller.
+        '''
+        if self.is_over():
+            return []
+        next_situation_player = self.next_player.other
+        return [
+            Move.play(point)
+            for point, next_hash in self.board.candidate_points(self.next_player)
+            if (next_situation_player, next_hash) not in self.previous_states]
+
     def winner(self):
         if not self.is_over():
             return None
@@ -0,0 +1,526 @@
+# This file is a version of goboard.py that stores the board in flat, padded arrays.
+# Points are plain integer indices and strings are linked lists threaded through those
+# arrays, so placing a stone only touches the strings next to it instead of rebuilding
+# frozensets, and copying a board never allocates per-string objects.
+
+from array import array
+
+import numpy as np
+
+from dlgo import goboard
+from dlgo import zobrist
+from dlgo.goboard import Move, GoString
+from dlgo.gotypes import Player, Point
+
+__all__ = [
+    'Board',
+    'GameState',
+    'Move',
+]
+
+EMPTY = 0
+BLACK = Player.black.value
+WHITE = Player.white.value
+BORDER = 3
+
+# Maps the colour stored in the array back to a Player (the border reads as empty)
+_COLOR_TO_PLAYER = (None, Player.black, Player.white, None)
+
+
+class _Geometry():
+    '''
+    Everything about a board that only depends on its size. The board is stored row by row
+    with a one point sentinel border, so Point(row, col) lives at index row * stride + col.
+    Geometries are shared by every board of the same size.
+    '''
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.stride = num_cols + 2
+        self.size = (num_rows + 2) * self.stride
+
+        self.points = [None] * self.size
+        self.on_board = []
+        for row in range(1, num_rows + 1):
+            for col in range(1, num_cols + 1):
+                index = row * self.stride + col
+                self.points[index] = Point(row, col)
+                self.on_board.append(index)
+
+        # Steps to the four neighbours of an index, for array code that can use the border
+        self.offsets = np.array([-self.stride, self.stride, -1, 1], dtype=np.int64)
+
+        # Only the neighbours that are on the board, so the hot loops never test for the border
+        self.neighbours = [()] * self.size
+        self.corners = [()] * self.size
+        for index in self.on_board:
+            s = self.stride
+            self.neighbours[index] = tuple(
+                n for n in (index - s, index + s, index - 1, index + 1)
+                if self.points[n] is not None)
+            self.corners[index] = tuple(
+                n for n in (index - s - 1, index - s + 1, index + s - 1, index + s + 1)
+                if self.points[n] is not None)
+
+        # Zobrist codes laid out as index * 2 + (colour - 1). on_board runs row by row, the same
+        # order as the table's point indices
+        stones = zobrist.hash_table(num_rows, num_cols).stones
+        self.hash_codes = array('q', bytes(8 * self.size * 2))
+        for point_index, index in enumerate(self.on_board):
+            self.hash_codes[index * 2] = stones[point_index * 2]
+            self.hash_codes[index * 2 + 1] = stones[point_index * 2 + 1]
+
+
+_GEOMETRIES = {}
+
+def _geometry(num_rows, num_cols):
+    geometry = _GEOMETRIES.get((num_rows, num_cols))
+    if geometry is None:
+        geometry = _Geometry(num_rows, num_cols)
+        _GEOMETRIES[num_rows, num_cols] = geometry
+    return geometry
+
+
+
+class Board():
+    def __init__(self, num_rows, num_cols):
+        # Creates the Board, with every point on it empty and the sentinel border filled in
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self._geometry = _geometry(num_rows, num_cols)
+        size = self._geometry.size
+        self._color = bytearray([BORDER]) * size
+        for index in self._geometry.on_board:
+            self._color[index] = EMPTY
+        # Every stone points at the head index of its string, and at the next stone of the
+        # same string (a circular linked list). The head also holds the number of stones and
+        # the pseudo-liberty count: one per (stone, empty neighbour) pair, so a liberty that
+        # touches two stones of the string is counted twice. Keeping everything in flat arrays
+        # means copying a board is a handful of memory copies.
+        self._head = array('h', bytes(2 * size))
+        self._next = array('h', bytes(2 * size))
+        self._size = array('h', bytes(2 * size))
+        self._pseudo_liberties = array('h', bytes(2 * size))
+        self._hash = zobrist.EMPTY_BOARD
+        self._undo_stack = []
+        # The empty points, kept as an unordered list in _empties[:_num_empty] plus the
+        # position of every empty point in that list, so adding and removing are O(1)
+        self._empties = array('h', self._geometry.on_board)
+        self._empty_position = array('h', bytes(2 * size))
+        for position, index in enumerate(self._geometry.on_board):
+            self._empty_position[index] = position
+        self._num_empty = len(self._geometry.on_board)
+
+    def place_stone(self, player, point: Point):
+        '''
+        1. Check if the point exists, and is not occupied
+        2. Identify point liberties, adjacent same colors, adjacent opposite colours
+        3. Merge with adjacent same colour strings
+        4. Reduce liberties for adjacent opposite colours
+        5. Remove any strings with 0 liberties
+        '''
+        assert self.is_on_grid(point)
+        index = point.row * self._geometry.stride + point.col
+        assert self._color[index] == EMPTY
+        self._place(player.value, index)
+
+    def play(self, player, point: Point):
+        # Places a stone in place and remembers how to take it back with undo()
+        assert self.is_on_grid(point)
+        index = point.row * self._geometry.stride + point.col
+        assert self._color[index] == EMPTY
+        self._undo_stack.append(self._place(player.value, index))
+
+    def undo(self):
+        '''
+        Takes back the last stone placed with play(), replaying its record backwards:
+        1. Put the captured strings back and take away the liberties they had handed out
+        2. Split the merged strings apart again
+        3. Empty the point and give the liberty back to the strings next to it
+        '''
+        index, old_next, old_size, old_pseudo, touched, merges, captures, old_hash = \
+            self._undo_stack.pop()
+        colors = self._color
+        heads = self._head
+        next_stone = self._next
+        sizes = self._size
+        pseudo_liberties = self._pseudo_liberties
+        neighbours = self._geometry.neighbours
+        # Captured strings keep their linked list, and they are always the opposite colour
+        captured_color = BLACK + WHITE - colors[index]
+        for head in reversed(captures):
+            stones = self._string_stones(head)
+            for stone in stones:
+                for neighbour in neighbours[stone]:
+                    if colors[neighbour] != EMPTY:
+                        pseudo_liberties[heads[neighbour]] -= 1
+            for stone in stones:
+                colors[stone] = captured_color
+                heads[stone] = head
+                self._remove_empty(stone)
+
+        for head, other_head in reversed(merges):
+            next_stone[head], next_stone[other_head] = next_stone[other_head], next_stone[head]
+            stone = other_head
+            while True:
+                heads[stone] = other_head
+                stone = next_stone[stone]
+                if stone == other_head:
+                    break
+            sizes[head] -= sizes[other_head]
+            pseudo_liberties[head] -= pseudo_liberties[other_head]
+
+        colors[index] = EMPTY
+        heads[index] = 0
+        self._add_empty(index)
+        next_stone[index] = old_next
+        sizes[index] = old_size
+        pseudo_liberties[index] = old_pseudo
+        for head in touched:
+            pseudo_liberties[head] += 1
+        self._hash = old_hash
+
+    def _add_empty(self, index):
+        self._empties[self._num_empty] = index
+        self._empty_position[index] = self._num_empty
+        self._num_empty += 1
+
+    def _remove_empty(self, index):
+        # Moves the last empty point into the slot being freed
+        self._num_empty -= 1
+        last = self._empties[self._num_empty]
+        position = self._empty_position[index]
+        self._empties[position] = last
+        self._empty_position[last] = position
+
+    def _place(self, color, index):
+        '''
+        Places a stone of the given colour and returns everything undo() needs to take it back:
+        the values the new stone overwrote, the strings that lost a liberty, the merges
+        (surviving head, absorbed head), the captured strings and the hash before the move.
+        '''
+        colors = self._color
+        heads = self._head
+        pseudo_liberties = self._pseudo_liberties
+        liberties = 0
+        touched = []
+        adjacent_same_color = []
+        adjacent_opposite_color = []
+        for neighbour in self._geometry.neighbours[index]:
+            neighbour_color = colors[neighbour]
+            if neighbour_color == EMPTY:
+                liberties += 1
+                continue
+            # The point stops being a liberty of every string next to it
+            head = heads[neighbour]
+            pseudo_liberties[head] -= 1
+            touched.append(head)
+            if neighbour_color == color:
+                if head not in adjacent_same_color:
+                    adjacent_same_color.append(head)
+            elif head not in adjacent_opposite_color:
+                adjacent_opposite_color.append(head)
+
+        record = (
+            index, self._next[index], self._size[index], pseudo_liberties[index],
+            touched, [], [], self._hash)
+        colors[index] = color
+        heads[index] = index
+        self._next[index] = index
+        self._size[index] = 1
+        pseudo_liberties[index] = liberties
+        self._remove_empty(index)
+
+        head = index
+        merges = record[5]
+        for same_color_head in adjacent_same_color:
+            merged = self._merge(head, same_color_head)
+            merges.append((merged, same_color_head if merged == head else head))
+            head = merged
+
+        self._hash ^= self._geometry.hash_codes[index * 2 + color - 1]
+
+        captures = record[6]
+        for other_color_head in adjacent_opposite_color:
+            if pseudo_liberties[other_color_head] == 0:
+                self._remove_string(other_color_head)
+                captures.append(other_color_head)
+        return record
+
+    def _merge(self, head, other_head):
+        # Relabels the smaller string into the larger one and returns the surviving head
+        sizes = self._size
+        if sizes[head] < sizes[other_head]:
+            head, other_head = other_head, head
+        heads = self._head
+        next_stone = self._next
+        stone = other_head
+        while True:
+            heads[stone] = head
+            stone = next_stone[stone]
+            if stone == other_head:
+                break
+        # Splice the two circular lists together
+        next_stone[head], next_stone[other_head] = next_stone[other_head], next_stone[head]
+        sizes[head] += sizes[other_head]
+        self._pseudo_liberties[head] += self._pseudo_liberties[other_head]
+        return head
+
+    def is_self_capture(self, player, point: Point):
+        return self._is_self_capture(player.value, point.row * self._geometry.stride + point.col)
+
+    def hash_after_move(self, player, point: Point):
+        # The zobrist hash the board would have after placing a stone here, taking captures into account
+        return self._hash_after(player.value, point.row * self._geometry.stride + point.col)
+
+    def _is_self_capture(self, color, index):
+        '''
+        Works out whether a stone here would be left without liberties, without placing it.
+        A neighbouring string has a liberty other than this point exactly when its pseudo-liberty
+        count is larger than the number of its stones touching this point. The move is fine if
+        any neighbour is:
+        1. Empty --> the new stone has a liberty
+        2. A friendly string with another liberty --> the merged string keeps it
+        3. An enemy string with no other liberty --> it gets captured, which frees a liberty
+        '''
+        colors = self._color
+        heads = self._head
+        neighbours = self._geometry.neighbours[index]
+        for neighbour in neighbours:
+            neighbour_color = colors[neighbour]
+            if neighbour_color == EMPTY:
+                return False
+            head = heads[neighbour]
+            touching = 0
+            for other in neighbours:
+                if heads[other] == head:
+                    touching += 1
+            if neighbour_color == color:
+                if self._pseudo_liberties[head] > touching:
+                    return False
+            elif self._pseudo_liberties[head] == touching:
+                return False
+        return True
+
+    def _hash_after(self, color, index):
+        hash_codes = self._geometry.hash_codes
+        colors = self._color
+        heads = self._head
+        neighbours = self._geometry.neighbours[index]
+        new_hash = self._hash ^ hash_codes[index * 2 + color - 1]
+        captured = []
+        for neighbour in neighbours:
+            neighbour_color = colors[neighbour]
+            if neighbour_color == EMPTY or neighbour_color == color:
+                continue
+            head = heads[neighbour]
+            if head in captured:
+                continue
+            touching = 0
+            for other in neighbours:
+                if heads[other] == head:
+                    touching += 1
+            if self._pseudo_liberties[head] == touching:
+                captured.append(head)
+                for stone in self._string_stones(head):
+                    new_hash ^= hash_codes[stone * 2 + neighbour_color - 1]
+        return new_hash
+
+    def _is_eye(self, color, index):
+        # Same test as agent.helpers.is_point_an_eye, on indices
+        colors = self._color
+        if colors[index] != EMPTY:
+            return False
+        for neighbour in self._geometry.neighbours[index]:
+            if colors[neighbour] != color:
+                return False
+        corners = self._geometry.corners[index]
+        friendly_corners = 0
+        for corner in corners:
+            if colors[corner] == color:
+                friendly_corners += 1
+        if len(corners) < 4:
+            return friendly_corners == len(corners)
+        return friendly_corners >= 3
+
+    def is_eye(self, point: Point, color):
+        return self._is_eye(color.value, point.row * self._geometry.stride + point.col)
+
+    def empty_points(self):
+        points = self._geometry.points
+        return [points[index] for index in self._empties[:self._num_empty]]
+
+    def candidate_points(self, player):
+        '''
+        Returns (point, hash after the move) for every empty point where the player can
+        play without capturing itself or filling one of its own eyes. Ko depends on the
+        game history, so the caller checks the hashes against it.
+        A point with an empty neighbour can be neither suicide nor an eye, and unless it
+        touches an enemy stone it captures nothing, so only the points hemmed in by stones
+        get the full checks.
+        '''
+        color = player.value
+        colors = self._color
+        neighbours = self._geometry.neighbours
+        hash_codes = self._geometry.hash_codes
+        points = self._geometry.points
+        code_offset = color - 1
+        candidates = []
+        for index in self._empties[:self._num_empty]:
+            has_liberty = False
+            touches_enemy = False
+            for neighbour in neighbours[index]:
+                neighbour_color = colors[neighbour]
+                if neighbour_color == EMPTY:
+                    has_liberty = True
+                elif neighbour_color != color:
+                    touches_enemy = True
+            if not has_liberty:
+                if self._is_self_capture(color, index) or self._is_eye(color, index):
+                    continue
+            if touches_enemy:
+                next_hash = self._hash_after(color, index)
+            else:
+                next_hash = self._hash ^ hash_codes[index * 2 + code_offset]
+            candidates.append((points[index], next_hash))
+        return candidates
+
+    def _string_stones(self, head):
+        stones = [head]
+        next_stone = self._next
+        stone = next_stone[head]
+        while stone != head:
+            stones.append(stone)
+            stone = next_stone[stone]
+        return stones
+
+    def _string_liberties(self, head):
+        colors = self._color
+        neighbours = self._geometry.neighbours
+        liberties = set()
+        for stone in self._string_stones(head):
+            for neighbour in neighbours[stone]:
+                if colors[neighbour] == EMPTY:
+                    liberties.add(neighbour)
+        return liberties
+
+    def _remove_string(self, head):
+        '''
+        Empties every point of the string first, then hands each of those points back as a
+        liberty to whichever neighbouring strings are left.
+        '''
+        colors = self._color
+        heads = self._head
+        hash_codes = self._geometry.hash_codes
+        stones = self._string_stones(head)
+        code_offset = colors[head] - 1
+        for stone in stones:
+            colors[stone] = EMPTY
+            heads[stone] = 0
+            self._hash ^= hash_codes[stone * 2 + code_offset]
+            self._add_empty(stone)
+        neighbours = self._geometry.neighbours
+        pseudo_liberties = self._pseudo_liberties
+        for stone in stones:
+            for neighbour in neighbours[stone]:
+                if colors[neighbour] != EMPTY:
+                    pseudo_liberties[heads[neighbour]] += 1
+
+    def is_on_grid(self, point: 'Point'):
+        return 1 <= point.row <= self.num_rows \
+        and 1 <= point.col <= self.num_cols
+
+    def get(self, point: 'Point'):
+        # Return the content of a point on the board --> Player if there is a stone, otherwise None
+        if not self.is_on_grid(point):
+            return None
+        return _COLOR_TO_PLAYER[self._color[point.row * self._geometry.stride + point.col]]
+
+    def as_array(self):
+        # The stones as an int8 array indexed [row - 1, col - 1]: 0 for empty, 1 for black, 2 for white
+        grid = np.frombuffer(self._color, dtype=np.int8).reshape(
+            self.num_rows + 2, self._geometry.stride)
+        return grid[1:-1, 1:-1].copy()
+
+    def liberty_array(self):
+        '''
+        The liberty count of the string on every point as an int16 array like as_array
+        (0 when empty). Pseudo-liberties count a shared liberty more than once, so the exact
+        counts are taken from the empty points: each one is a liberty of every distinct string
+        next to it. That is done for the whole board in a few array operations.
+        '''
+        geometry = self._geometry
+        colors = np.frombuffer(self._color, dtype=np.uint8)
+        heads = np.frombuffer(self._head, dtype=np.int16)
+        empties = np.frombuffer(self._empties, dtype=np.int16)[:self._num_empty]
+        neighbours = empties[:, np.newaxis] + geometry.offsets
+        neighbour_heads = np.where(colors[neighbours] == BORDER, 0, heads[neighbours])
+        # Count a string once per empty point, even when it touches the point more than once
+        counted = neighbour_heads > 0
+        for later in range(1, 4):
+            for earlier in range(later):
+                counted[:, later] &= neighbour_heads[:, later] != neighbour_heads[:, earlier]
+        counts = np.bincount(neighbour_heads[counted], minlength=geometry.size).astype(np.int16)
+        liberties = counts[heads]
+        return liberties.reshape(self.num_rows + 2, geometry.stride)[1:-1, 1:-1].copy()
+
+    def get_go_string(self, point: 'Point'):
+        # Builds a GoString for the string at a point --> GoString if there is a stone, otherwise None
+        if not self.is_on_grid(point):
+            return None
+        head = self._head[point.row * self._geometry.stride + point.col]
+        if head == 0:
+            return None
+        points = self._geometry.points
+        return GoString(
+            _COLOR_TO_PLAYER[self._color[head]],
+            [points[stone] for stone in self._string_stones(head)],
+            [points[liberty] for liberty in self._string_liberties(head)])
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and \
+            self.num_rows == other.num_rows and \
+            self.num_cols == other.num_cols and \
+            self._hash == other._hash
+
+    def __deepcopy__(self, memodict={}):
+        copied = Board.__new__(Board)
+        copied.num_rows = self.num_rows
+        copied.num_cols = self.num_cols
+        copied._geometry = self._geometry
+        copied._color = self._color[:]
+        copied._head = self._head[:]
+        copied._next = self._next[:]
+        copied._size = self._size[:]
+        copied._pseudo_liberties = self._pseudo_liberties[:]
+        copied._hash = self._hash
+        copied._undo_stack = []
+        copied._empties = self._empties[:]
+        copied._empty_position = self._empty_position[:]
+        copied._num_empty = self._num_empty
+        return copied
+
+    def __getstate__(self):
+        # The geometry is shared by every board of the same size, so it is rebuilt on unpickling
+        state = self.__dict__.copy()
+        del state['_geometry']
+        state['_undo_stack'] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._geometry = _geometry(self.num_rows, self.num_cols)
+
+    def zobrist_hash(self):
+        return self._hash
+
+
+
+class GameState(goboard.GameState):
+    # The same game logic as goboard.GameState, played out on the flat array Board
+    @classmethod
+    def new_game(cls, board_size):
+        if isinstance(board_size, int):
+            board_size = (board_size, board_size)
+        board = Board(*board_size)
+        return cls(board, Player.black, None, None)
@@ -0,0 +1,164 @@
+# Light playouts for Monte Carlo rollouts: a uniformly random, eye-preserving game played to the
+# end on a single mutable flat board, without building a GameState for every move.
+
+import copy
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from dlgo import goboard_fast
+from dlgo.goboard_fast import EMPTY, BLACK, WHITE
+from dlgo.gotypes import Player, Point
+from dlgo.scoring import GameResult
+
+__all__ = [
+    'PlayoutResult',
+    'random_playout',
+]
+
+KOMI = 7.5
+
+# Ownership maps use +1 for black, -1 for white and 0 for dame, indexed [row - 1, col - 1]
+_OWNER_SIGN = (0, 1, -1)
+_COLOR_TO_PLAYER = (None, Player.black, Player.white)
+
+
+class PlayoutResult(namedtuple('PlayoutResult', 'winner game_result ownership')):
+    pass
+
+
+def flat_board(board):
+    # Returns a private goboard_fast.Board holding the same position as the given board
+    if isinstance(board, goboard_fast.Board):
+        return copy.deepcopy(board)
+    flat = goboard_fast.Board(board.num_rows, board.num_cols)
+    for row in range(1, board.num_rows + 1):
+        for col in range(1, board.num_cols + 1):
+            point = Point(row, col)
+            stone = board.get(point)
+            if stone is not None:
+                flat.place_stone(stone, point)
+    return flat
+
+
+def random_playout(game_state, rng=random, with_ownership=False, komi=KOMI, max_moves=None):
+    '''
+    Plays the game on from game_state until both players pass and scores it.
+    1. Copy the position onto a flat board
+    2. Each turn, draw empty points at random (without replacement) until one is legal and
+        is not one of the mover's own eyes, and play it. If there is none, pass.
+    3. Score the final board with area scoring
+    The first move respects the positional superko history of game_state; after that only
+    simple ko is tracked, which is the usual shortcut for playouts. Games are cut off after
+    max_moves (three times the board area by default) so ko cycles cannot run forever.
+    '''
+    if game_state.is_over():
+        if game_state.last_move.is_resign:
+            return PlayoutResult(game_state.next_player, None, None)
+        board = flat_board(game_state.board)
+        return _playout_result(board, komi, with_ownership)
+
+    board = flat_board(game_state.board)
+    if max_moves is None:
+        max_moves = 3 * len(board._geometry.on_board)
+
+    color = game_state.next_player.value
+    passes = 1 if game_state.last_move is not None and game_state.last_move.is_pass else 0
+    ko_point = None
+    history = game_state.previous_states
+    first_move = True
+    num_moves = 0
+    while passes < 2 and num_moves < max_moves:
+        candidates = board._empties[:board._num_empty].tolist()
+        remaining = len(candidates)
+        chosen = None
+        while remaining:
+            # Draw without replacement: swap the drawn point out of the live part of the list
+            i = int(rng.random() * remaining)
+            index = candidates[i]
+            remaining -= 1
+            candidates[i] = candidates[remaining]
+            if index == ko_point or board._is_eye(color, index):
+                continue
+            if board._is_self_capture(color, index):
+                continue
+            if first_move:
+                next_situation = (_COLOR_TO_PLAYER[BLACK + WHITE - color],
+                                  board._hash_after(color, index))
+                if next_situation in history:
+                    continue
+            chosen = index
+            break
+
+        first_move = False
+        num_moves += 1
+        if chosen is None:
+            passes += 1
+            ko_point = None
+            color = BLACK + WHITE - color
+            continue
+        passes = 0
+        captures = board._place(color, chosen)[6]
+        ko_point = None
+        # Simple ko: a single stone that captured a single stone and is now in atari itself
+        if len(captures) == 1 and board._size[captures[0]] == 1:
+            head = board._head[chosen]
+            if board._size[head] == 1 and board._pseudo_liberties[head] == 1:
+                ko_point = captures[0]
+        color = BLACK + WHITE - color
+
+    return _playout_result(board, komi, with_ownership)
+
+
+def _playout_result(board, komi, with_ownership):
+    black, white, owner = _area_score(board)
+    game_result = GameResult(black, white, komi)
+    ownership = None
+    if with_ownership:
+        ownership = np.array(
+            [_OWNER_SIGN[owner[index]] for index in board._geometry.on_board],
+            dtype=np.int8).reshape(board.num_rows, board.num_cols)
+    return PlayoutResult(game_result.winner, game_result, ownership)
+
+
+def _area_score(board):
+    '''
+    Area scoring on the flat board: stones count for their colour, and an empty region counts
+    for a colour when that is the only colour it touches. Returns the black and white totals
+    and the owning colour (or EMPTY for dame) of every index.
+    '''
+    colors = board._color
+    neighbours = board._geometry.neighbours
+    owner = list(colors)
+    seen = set()
+    for start in board._empties[:board._num_empty]:
+        if start in seen:
+            continue
+        seen.add(start)
+        region = [start]
+        borders = 0
+        stack = [start]
+        while stack:
+            index = stack.pop()
+            for neighbour in neighbours[index]:
+                neighbour_color = colors[neighbour]
+                if neighbour_color == EMPTY:
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        region.append(neighbour)
+                        stack.append(neighbour)
+                else:
+                    borders |= neighbour_color
+        # borders is a bit mask of the colours seen: 1 for black, 2 for white, 3 for both
+        region_owner = borders if borders in (BLACK, WHITE) else EMPTY
+        for index in region:
+            owner[index] = region_owner
+    black = 0
+    white = 0
+    for index in board._geometry.on_board:
+        if owner[index] == BLACK:
+            black += 1
+        elif owner[index] == WHITE:
+            white += 1
+    return black, white, owner
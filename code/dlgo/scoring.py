@@ -2,6 +2,8 @@
 
 from collections import namedtuple
 
+import numpy as np
+
 from dlgo.gotypes import Player, Point
 
 class Territory(object):
@@ -43,56 +45,90 @@ class GameResult(namedtuple('GameResult', 'b w komi')):
             return 'B+%.1f' % (self.b - w,)
         return 'W+%.1f' % (w - self.b,)
 
+class BatchResult(namedtuple('BatchResult', 'winners margins ownership')):
+    pass
+
 def evaluate_territory(board):
+    # Scores the board as an int8 array (see board_to_array) instead of point by point
+    return territory_from_array(board_to_array(board))
 
-    status = {}
+def board_to_array(board):
+    # The stones as an int8 array indexed [row - 1, col - 1]: 0 for empty, 1 for black, 2 for white
+    if hasattr(board, 'as_array'):
+        return board.as_array()
+    stones = np.zeros((board.num_rows, board.num_cols), dtype=np.int8)
     for r in range(1, board.num_rows + 1):
         for c in range(1, board.num_cols + 1):
-            p = Point(row=r, col=c)
-            if p in status:  # <1>
-                continue
-            stone = board.get(p)
-            if stone is not None:  # <2>
-                status[p] = board.get(p)
-            else:
-                group, neighbors = _collect_region(p, board)
-                if len(neighbors) == 1:  # <3>
-                    neighbor_stone = neighbors.pop()
-                    stone_str = 'b' if neighbor_stone == Player.black else 'w'
-                    fill_with = 'territory_' + stone_str
-                else:
-                    fill_with = 'dame'  # <4>
-                for pos in group:
-                    status[pos] = fill_with
-    return Territory(status)
+            stone = board.get(Point(row=r, col=c))
+            if stone is not None:
+                stones[r - 1, c - 1] = stone.value
+    return stones
 
-def _collect_region(start_pos, board, visited=None):
+def territory_from_array(stones):
+    black_territory, white_territory, dame = territory_masks(stones)
+    territory = Territory({})
+    territory.num_black_stones = int(np.count_nonzero(stones == Player.black.value))
+    territory.num_white_stones = int(np.count_nonzero(stones == Player.white.value))
+    territory.num_black_territory = int(np.count_nonzero(black_territory))
+    territory.num_white_territory = int(np.count_nonzero(white_territory))
+    territory.num_dame = int(np.count_nonzero(dame))
+    territory.dame_points = [Point(row=r + 1, col=c + 1) for r, c in np.argwhere(dame)]
+    return territory
 
-    if visited is None:
-        visited = {}
-    if start_pos in visited:
-        return [], set()
-    all_points = [start_pos]
-    all_borders = set()
-    visited[start_pos] = True
-    here = board.get(start_pos)
-    deltas = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for delta_r, delta_c in deltas:
-        next_p = Point(row=start_pos.row + delta_r, col=start_pos.col + delta_c)
-        if not board.is_on_grid(next_p):
-            continue
-        neighbor = board.get(next_p)
-        if neighbor == here:
-            points, borders = _collect_region(next_p, board, visited)
-            all_points += points
-            all_borders |= borders
-        else:
-            all_borders.add(neighbor)
-    return all_points, all_borders
+def territory_masks(stones):
+    '''
+    Splits the empty points of one board [rows, cols] (or a stack of them [..., rows, cols])
+    into black territory, white territory and dame, as boolean arrays of the same shape.
+    An empty region belongs to a colour when that is the only colour it touches. Rather than
+    collecting each region, every colour is grown out from its stones across empty points
+    until it stops spreading; an empty point is territory if exactly one colour reaches it.
+    The number of steps is the longest path through an empty region, not the number of points.
+    '''
+    empty = stones == 0
+    reaches_black = _reachable(stones == Player.black.value, empty)
+    reaches_white = _reachable(stones == Player.white.value, empty)
+    black_territory = empty & reaches_black & ~reaches_white
+    white_territory = empty & reaches_white & ~reaches_black
+    # Regions that touch both colours, or no stones at all
+    dame = empty & ~(black_territory | white_territory)
+    return black_territory, white_territory, dame
+
+def _reachable(reached, empty):
+    # Grows the reached mask one step at a time through empty points until nothing changes
+    reached = reached.copy()
+    grown = np.empty_like(reached)
+    while True:
+        grown[...] = reached
+        grown[..., 1:, :] |= reached[..., :-1, :]
+        grown[..., :-1, :] |= reached[..., 1:, :]
+        grown[..., :, 1:] |= reached[..., :, :-1]
+        grown[..., :, :-1] |= reached[..., :, 1:]
+        grown &= empty | reached
+        if np.array_equal(grown, reached):
+            return reached
+        reached, grown = grown, reached
 
 def compute_game_result(game_state):
     territory = evaluate_territory(game_state.board)
     return GameResult(
         territory.num_black_territory + territory.num_black_stones,
         territory.num_white_territory + territory.num_white_stones,
-        komi=7.5)
\ No newline at end of file
+        komi=7.5)
+
+def score_batch(boards, komi=7.5):
+    '''
+    Area scores a stack of final boards [B, rows, cols] (int8, as from board_to_array) in one
+    pass and returns a BatchResult of NumPy arrays:
+    winners: [B] int8, the winning Player's value (1 for black, 2 for white)
+    margins: [B] float, the winning margin as in GameResult.winning_margin
+    ownership: [B, rows, cols] int8, +1 for black stones and territory, -1 for white, 0 for dame
+    '''
+    boards = np.asarray(boards, dtype=np.int8)
+    black_territory, white_territory, _ = territory_masks(boards)
+    black_area = (boards == Player.black.value) | black_territory
+    white_area = (boards == Player.white.value) | white_territory
+    ownership = black_area.astype(np.int8) - white_area.astype(np.int8)
+    difference = black_area.sum(axis=(1, 2)) - white_area.sum(axis=(1, 2)) - komi
+    # As in GameResult, white wins when the scores are level
+    winners = np.where(difference > 0, Player.black.value, Player.white.value).astype(np.int8)
+    return BatchResult(winners, np.abs(difference), ownership)
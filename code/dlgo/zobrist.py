@@ -1,730 +1,61 @@
-from .gotypes import Player, Point
+import random
+from array import array
 
-__all__ = ['HASH_CODE', 'EMPTY_BOARD']
+from .gotypes import Player
 
-HASH_CODE = {
-    (Point(row=1, col=1), Player.black): 6837467988442080836,
-    (Point(row=1, col=1), Player.white): 2945078261318038007,
-    (Point(row=1, col=2), Player.black): 7888288309822195633,
-    (Point(row=1, col=2), Player.white): 957487692102159367,
-    (Point(row=1, col=3), Player.black): 3028806074783963688,
-    (Point(row=1, col=3), Player.white): 199838322797249094,
-    (Point(row=1, col=4), Player.black): 6288124411684938659,
-    (Point(row=1, col=4), Player.white): 5245700616308327551,
-    (Point(row=1, col=5), Player.black): 3971289956410318625,
-    (Point(row=1, col=5), Player.white): 7822538125685989336,
-    (Point(row=1, col=6), Player.black): 5452513073733919790,
-    (Point(row=1, col=6), Player.white): 5521350073344056081,
-    (Point(row=1, col=7), Player.black): 6023774048200449227,
-    (Point(row=1, col=7), Player.white): 6606286892929060704,
-    (Point(row=1, col=8), Player.black): 459010612003073217,
-    (Point(row=1, col=8), Player.white): 8394505698991284024,
-    (Point(row=1, col=9), Player.black): 4024840952041943725,
-    (Point(row=1, col=9), Player.white): 525238483203548499,
-    (Point(row=1, col=10), Player.black): 8164447003626600382,
-    (Point(row=1, col=10), Player.white): 2226767149545051856,
-    (Point(row=1, col=11), Player.black): 3540446758699261373,
-    (Point(row=1, col=11), Player.white): 3758706130365404148,
-    (Point(row=1, col=12), Player.black): 4817895116424948911,
-    (Point(row=1, col=12), Player.white): 5851379179149709155,
-    (Point(row=1, col=13), Player.black): 5516459468767011559,
-    (Point(row=1, col=13), Player.white): 453693698164403052,
-    (Point(row=1, col=14), Player.black): 8271711303979144908,
-    (Point(row=1, col=14), Player.white): 2709221031415473081,
-    (Point(row=1, col=15), Player.black): 5656590894735024097,
-    (Point(row=1, col=15), Player.white): 7609630806122053720,
-    (Point(row=1, col=16), Player.black): 7726433475559249228,
-    (Point(row=1, col=16), Player.white): 2198943659442254816,
-    (Point(row=1, col=17), Player.black): 3186801720538454378,
-    (Point(row=1, col=17), Player.white): 7150327985773673912,
-    (Point(row=1, col=18), Player.black): 3292620448292176792,
-    (Point(row=1, col=18), Player.white): 1075826970682331053,
-    (Point(row=1, col=19), Player.black): 3330520183005985715,
-    (Point(row=1, col=19), Player.white): 2849251984577569612,
-    (Point(row=2, col=1), Player.black): 1230457938775488225,
-    (Point(row=2, col=1), Player.white): 5654340537069516766,
-    (Point(row=2, col=2), Player.black): 9152610606863294613,
-    (Point(row=2, col=2), Player.white): 6626214543497155791,
-    (Point(row=2, col=3), Player.black): 3911684946511771428,
-    (Point(row=2, col=3), Player.white): 2222868586412923390,
-    (Point(row=2, col=4), Player.black): 4746737492821553957,
-    (Point(row=2, col=4), Player.white): 4232432749102805056,
-    (Point(row=2, col=5), Player.black): 8301327668817472027,
-    (Point(row=2, col=5), Player.white): 7366295315854057658,
-    (Point(row=2, col=6), Player.black): 338511403234000962,
-    (Point(row=2, col=6), Player.white): 7724019293589591527,
-    (Point(row=2, col=7), Player.black): 6953419442996414780,
-    (Point(row=2, col=7), Player.white): 8502224813735959738,
-    (Point(row=2, col=8), Player.black): 27582238013110901,
-    (Point(row=2, col=8), Player.white): 5265728423327095925,
-    (Point(row=2, col=9), Player.black): 925468196765483152,
-    (Point(row=2, col=9), Player.white): 8404129788523556624,
-    (Point(row=2, col=10), Player.black): 3190578214265674317,
-    (Point(row=2, col=10), Player.white): 179729726169805199,
-    (Point(row=2, col=11), Player.black): 218247192904307463,
-    (Point(row=2, col=11), Player.white): 2974792658799307565,
-    (Point(row=2, col=12), Player.black): 3165475480289362925,
-    (Point(row=2, col=12), Player.white): 9000265499117150699,
-    (Point(row=2, col=13), Player.black): 6253498482051285065,
-    (Point(row=2, col=13), Player.white): 2108388492880112940,
-    (Point(row=2, col=14), Player.black): 9110621672074692539,
-    (Point(row=2, col=14), Player.white): 283572336414551121,
-    (Point(row=2, col=15), Player.black): 1785960422637634402,
-    (Point(row=2, col=15), Player.white): 6924228126577688227,
-    (Point(row=2, col=16), Player.black): 6513889249363108861,
-    (Point(row=2, col=16), Player.white): 6706194768126038118,
-    (Point(row=2, col=17), Player.black): 2333187030831863077,
-    (Point(row=2, col=17), Player.white): 7113077004014804199,
-    (Point(row=2, col=18), Player.black): 6157785381771254364,
-    (Point(row=2, col=18), Player.white): 1608055587251553977,
-    (Point(row=2, col=19), Player.black): 8318781192235589692,
-    (Point(row=2, col=19), Player.white): 9043863386891224602,
-    (Point(row=3, col=1), Player.black): 8054005981357394193,
-    (Point(row=3, col=1), Player.white): 6355927806207320654,
-    (Point(row=3, col=2), Player.black): 5915444278553579878,
-    (Point(row=3, col=2), Player.white): 9194069783554435825,
-    (Point(row=3, col=3), Player.black): 6103589973701194228,
-    (Point(row=3, col=3), Player.white): 2852511732837943561,
-    (Point(row=3, col=4), Player.black): 1105965352816110178,
-    (Point(row=3, col=4), Player.white): 4251397590408877087,
-    (Point(row=3, col=5), Player.black): 5755862964910686816,
-    (Point(row=3, col=5), Player.white): 2441824930284255847,
-    (Point(row=3, col=6), Player.black): 7312571662852323146,
-    (Point(row=3, col=6), Player.white): 4039083444771932194,
-    (Point(row=3, col=7), Player.black): 4748867587203748432,
-    (Point(row=3, col=7), Player.white): 871125916835981466,
-    (Point(row=3, col=8), Player.black): 8500198982266114114,
-    (Point(row=3, col=8), Player.white): 4431064836039400874,
-    (Point(row=3, col=9), Player.black): 6003121379533815961,
-    (Point(row=3, col=9), Player.white): 77316916113790036,
-    (Point(row=3, col=10), Player.black): 1856275290893577211,
-    (Point(row=3, col=10), Player.white): 6237619668917449172,
-    (Point(row=3, col=11), Player.black): 7722760661203761595,
-    (Point(row=3, col=11), Player.white): 9097944991082763839,
-    (Point(row=3, col=12), Player.black): 7606432321927571497,
-    (Point(row=3, col=12), Player.white): 1373348772266265413,
-    (Point(row=3, col=13), Player.black): 5416129008678456602,
-    (Point(row=3, col=13), Player.white): 8080548322961940094,
-    (Point(row=3, col=14), Player.black): 6871646209966770251,
-    (Point(row=3, col=14), Player.white): 4904082458774321422,
-    (Point(row=3, col=15), Player.black): 7666063014829623733,
-    (Point(row=3, col=15), Player.white): 2228354948315933231,
-    (Point(row=3, col=16), Player.black): 7682667708805146233,
-    (Point(row=3, col=16), Player.white): 1515767316213901112,
-    (Point(row=3, col=17), Player.black): 4741064371221916424,
-    (Point(row=3, col=17), Player.white): 4121263842585375751,
-    (Point(row=3, col=18), Player.black): 8193198512047873537,
-    (Point(row=3, col=18), Player.white): 8831678353814002308,
-    (Point(row=3, col=19), Player.black): 5659453081748977432,
-    (Point(row=3, col=19), Player.white): 5355780536425711970,
-    (Point(row=4, col=1), Player.black): 7191815819901356899,
-    (Point(row=4, col=1), Player.white): 1570739392330345557,
-    (Point(row=4, col=2), Player.black): 3315108569839032437,
-    (Point(row=4, col=2), Player.white): 5560430811407223490,
-    (Point(row=4, col=3), Player.black): 2494060194040923113,
-    (Point(row=4, col=3), Player.white): 3628510288209810401,
-    (Point(row=4, col=4), Player.black): 6047995681776509829,
-    (Point(row=4, col=4), Player.white): 6378442313855410734,
-    (Point(row=4, col=5), Player.black): 1535963547025329148,
-    (Point(row=4, col=5), Player.white): 1703739763416707647,
-    (Point(row=4, col=6), Player.black): 2745520125361543537,
-    (Point(row=4, col=6), Player.white): 8043936724105803746,
-    (Point(row=4, col=7), Player.black): 6414832107544646066,
-    (Point(row=4, col=7), Player.white): 2331478570725097521,
-    (Point(row=4, col=8), Player.black): 1947081456571539015,
-    (Point(row=4, col=8), Player.white): 1786808550374853720,
-    (Point(row=4, col=9), Player.black): 8959375349811122955,
-    (Point(row=4, col=9), Player.white): 221583992471328403,
-    (Point(row=4, col=10), Player.black): 7235361100292442556,
-    (Point(row=4, col=10), Player.white): 2158658997949766623,
-    (Point(row=4, col=11), Player.black): 7840458378705855486,
-    (Point(row=4, col=11), Player.white): 7852694077672571584,
-    (Point(row=4, col=12), Player.black): 2222480227901654534,
-    (Point(row=4, col=12), Player.white): 8613798456378829261,
-    (Point(row=4, col=13), Player.black): 1156300550886813227,
-    (Point(row=4, col=13), Player.white): 5220089258521923057,
-    (Point(row=4, col=14), Player.black): 5216788495391884073,
-    (Point(row=4, col=14), Player.white): 1002050578310034099,
-    (Point(row=4, col=15), Player.black): 4993724315330774353,
-    (Point(row=4, col=15), Player.white): 1085899543939783672,
-    (Point(row=4, col=16), Player.black): 595669359227793753,
-    (Point(row=4, col=16), Player.white): 7117892304471149093,
-    (Point(row=4, col=17), Player.black): 2367870320334104671,
-    (Point(row=4, col=17), Player.white): 4642586881033007467,
-    (Point(row=4, col=18), Player.black): 7995685518054142842,
-    (Point(row=4, col=18), Player.white): 5424213275648977544,
-    (Point(row=4, col=19), Player.black): 2925173636925092722,
-    (Point(row=4, col=19), Player.white): 4155881026765445060,
-    (Point(row=5, col=1), Player.black): 5523712820368584032,
-    (Point(row=5, col=1), Player.white): 4970116820218418419,
-    (Point(row=5, col=2), Player.black): 2727829114355801992,
-    (Point(row=5, col=2), Player.white): 2392298938816746523,
-    (Point(row=5, col=3), Player.black): 9025684949612434513,
-    (Point(row=5, col=3), Player.white): 73136967938395946,
-    (Point(row=5, col=4), Player.black): 2602467747174428371,
-    (Point(row=5, col=4), Player.white): 2062717270143052682,
-    (Point(row=5, col=5), Player.black): 6211082655482184252,
-    (Point(row=5, col=5), Player.white): 2379443988489737156,
-    (Point(row=5, col=6), Player.black): 5513713036133032321,
-    (Point(row=5, col=6), Player.white): 3972286993053210763,
-    (Point(row=5, col=7), Player.black): 577585115154464054,
-    (Point(row=5, col=7), Player.white): 4450893232598240908,
-    (Point(row=5, col=8), Player.black): 3114001084703238512,
-    (Point(row=5, col=8), Player.white): 4997963642920619626,
-    (Point(row=5, col=9), Player.black): 8624250624020722577,
-    (Point(row=5, col=9), Player.white): 332963470340932773,
-    (Point(row=5, col=10), Player.black): 6642246357787585831,
-    (Point(row=5, col=10), Player.white): 528613390564051274,
-    (Point(row=5, col=11), Player.black): 602010866365508253,
-    (Point(row=5, col=11), Player.white): 6220972393808828930,
-    (Point(row=5, col=12), Player.black): 4282105268558390780,
-    (Point(row=5, col=12), Player.white): 398732867633716180,
-    (Point(row=5, col=13), Player.black): 5282171502385762498,
-    (Point(row=5, col=13), Player.white): 6217159270870647808,
-    (Point(row=5, col=14), Player.black): 1843175750689287403,
-    (Point(row=5, col=14), Player.white): 2549775106362681413,
-    (Point(row=5, col=15), Player.black): 6950447767067069806,
-    (Point(row=5, col=15), Player.white): 1684336325123881113,
-    (Point(row=5, col=16), Player.black): 7177121893787293217,
-    (Point(row=5, col=16), Player.white): 5409043317795649362,
-    (Point(row=5, col=17), Player.black): 5647487141612583787,
-    (Point(row=5, col=17), Player.white): 8268201851821772815,
-    (Point(row=5, col=18), Player.black): 8657405290013677213,
-    (Point(row=5, col=18), Player.white): 3770586611690469152,
-    (Point(row=5, col=19), Player.black): 3049467698521056909,
-    (Point(row=5, col=19), Player.white): 8568679113233522454,
-    (Point(row=6, col=1), Player.black): 8178590552076203280,
-    (Point(row=6, col=1), Player.white): 8389009969837973064,
-    (Point(row=6, col=2), Player.black): 6011354391091886316,
-    (Point(row=6, col=2), Player.white): 6163628650145609581,
-    (Point(row=6, col=3), Player.black): 127053719873704590,
-    (Point(row=6, col=3), Player.white): 3601763887555834412,
-    (Point(row=6, col=4), Player.black): 556769801005353654,
-    (Point(row=6, col=4), Player.white): 8831641084756163734,
-    (Point(row=6, col=5), Player.black): 8160332896397117538,
-    (Point(row=6, col=5), Player.white): 4907176037512376893,
-    (Point(row=6, col=6), Player.black): 6185685625740862573,
-    (Point(row=6, col=6), Player.white): 1178143954570981157,
-    (Point(row=6, col=7), Player.black): 7111238809285613561,
-    (Point(row=6, col=7), Player.white): 3367917578596794301,
-    (Point(row=6, col=8), Player.black): 2406444315702622372,
-    (Point(row=6, col=8), Player.white): 2273404995799707298,
-    (Point(row=6, col=9), Player.black): 2491217088912142316,
-    (Point(row=6, col=9), Player.white): 571185915741884630,
-    (Point(row=6, col=10), Player.black): 1821387323713489977,
-    (Point(row=6, col=10), Player.white): 5823638815821652248,
-    (Point(row=6, col=11), Player.black): 2088107243357992243,
-    (Point(row=6, col=11), Player.white): 2535461012464528025,
-    (Point(row=6, col=12), Player.black): 7295544157353877425,
-    (Point(row=6, col=12), Player.white): 5056020693589483575,
-    (Point(row=6, col=13), Player.black): 6741841310053494052,
-    (Point(row=6, col=13), Player.white): 6632052734276109439,
-    (Point(row=6, col=14), Player.black): 2704089501615381601,
-    (Point(row=6, col=14), Player.white): 4950555059735807405,
-    (Point(row=6, col=15), Player.black): 3740767305044699555,
-    (Point(row=6, col=15), Player.white): 1748302786144508290,
-    (Point(row=6, col=16), Player.black): 3979587743411988737,
-    (Point(row=6, col=16), Player.white): 5596443042066122521,
-    (Point(row=6, col=17), Player.black): 3926471484525525645,
-    (Point(row=6, col=17), Player.white): 126842163738473748,
-    (Point(row=6, col=18), Player.black): 8713528020344448962,
-    (Point(row=6, col=18), Player.white): 2829701760143732519,
-    (Point(row=6, col=19), Player.black): 7004475118845441698,
-    (Point(row=6, col=19), Player.white): 6877694659777114627,
-    (Point(row=7, col=1), Player.black): 3541888814681121503,
-    (Point(row=7, col=1), Player.white): 9178563658381841677,
-    (Point(row=7, col=2), Player.black): 6179824852522107231,
-    (Point(row=7, col=2), Player.white): 9114268273197582819,
-    (Point(row=7, col=3), Player.black): 7227015217322412309,
-    (Point(row=7, col=3), Player.white): 4131757333370663763,
-    (Point(row=7, col=4), Player.black): 2854423499224703480,
-    (Point(row=7, col=4), Player.white): 2311114321691201920,
-    (Point(row=7, col=5), Player.black): 4297587072398704611,
-    (Point(row=7, col=5), Player.white): 4858817567132003360,
-    (Point(row=7, col=6), Player.black): 3126960899956688310,
-    (Point(row=7, col=6), Player.white): 3757494640577830794,
-    (Point(row=7, col=7), Player.black): 6829620413030942799,
-    (Point(row=7, col=7), Player.white): 8056751324824431368,
-    (Point(row=7, col=8), Player.black): 5567443589061649984,
-    (Point(row=7, col=8), Player.white): 7707801516028499984,
-    (Point(row=7, col=9), Player.black): 8432103535184441937,
-    (Point(row=7, col=9), Player.white): 7742905565530534600,
-    (Point(row=7, col=10), Player.black): 3638717753955582862,
-    (Point(row=7, col=10), Player.white): 5800439953963576962,
-    (Point(row=7, col=11), Player.black): 6693845354058407772,
-    (Point(row=7, col=11), Player.white): 7956891933627299498,
-    (Point(row=7, col=12), Player.black): 7704352947747683151,
-    (Point(row=7, col=12), Player.white): 2452181391630096190,
-    (Point(row=7, col=13), Player.black): 4736776631555264576,
-    (Point(row=7, col=13), Player.white): 1699729239765592644,
-    (Point(row=7, col=14), Player.black): 4168080028109309168,
-    (Point(row=7, col=14), Player.white): 3328396154211128012,
-    (Point(row=7, col=15), Player.black): 2823030084979032843,
-    (Point(row=7, col=15), Player.white): 6871801960676038563,
-    (Point(row=7, col=16), Player.black): 8304695365392570059,
-    (Point(row=7, col=16), Player.white): 8875339933494632656,
-    (Point(row=7, col=17), Player.black): 8604461649161524171,
-    (Point(row=7, col=17), Player.white): 1242870355187129314,
-    (Point(row=7, col=18), Player.black): 8063284274084659251,
-    (Point(row=7, col=18), Player.white): 5851603558850483540,
-    (Point(row=7, col=19), Player.black): 7941373106512090646,
-    (Point(row=7, col=19), Player.white): 8961519943280697284,
-    (Point(row=8, col=1), Player.black): 3067018861588244860,
-    (Point(row=8, col=1), Player.white): 4574269382423717026,
-    (Point(row=8, col=2), Player.black): 3385316536368763993,
-    (Point(row=8, col=2), Player.white): 5137313084297232792,
-    (Point(row=8, col=3), Player.black): 2055401029738340949,
-    (Point(row=8, col=3), Player.white): 2651405024831440617,
-    (Point(row=8, col=4), Player.black): 3529471563529357401,
-    (Point(row=8, col=4), Player.white): 1955941639879698598,
-    (Point(row=8, col=5), Player.black): 6039519982958625537,
-    (Point(row=8, col=5), Player.white): 8150455082824185947,
-    (Point(row=8, col=6), Player.black): 5699002097392548580,
-    (Point(row=8, col=6), Player.white): 3690969503483229483,
-    (Point(row=8, col=7), Player.black): 2964684968836551890,
-    (Point(row=8, col=7), Player.white): 4420100194069442052,
-    (Point(row=8, col=8), Player.black): 3906887557669503175,
-    (Point(row=8, col=8), Player.white): 8310617908206459881,
-    (Point(row=8, col=9), Player.black): 9070622771035103436,
-    (Point(row=8, col=9), Player.white): 5149028541700199072,
-    (Point(row=8, col=10), Player.black): 1342932818773546555,
-    (Point(row=8, col=10), Player.white): 6371330761075515099,
-    (Point(row=8, col=11), Player.black): 7484957629082373484,
-    (Point(row=8, col=11), Player.white): 9190279614559862104,
-    (Point(row=8, col=12), Player.black): 4195305351461240872,
-    (Point(row=8, col=12), Player.white): 8626958653059242331,
-    (Point(row=8, col=13), Player.black): 3648457813941709975,
-    (Point(row=8, col=13), Player.white): 4685960247594532549,
-    (Point(row=8, col=14), Player.black): 6134887218761027320,
-    (Point(row=8, col=14), Player.white): 904805307379846724,
-    (Point(row=8, col=15), Player.black): 3751145584562900457,
-    (Point(row=8, col=15), Player.white): 8975604410357308774,
-    (Point(row=8, col=16), Player.black): 1856316322032321097,
-    (Point(row=8, col=16), Player.white): 1522100209938152465,
-    (Point(row=8, col=17), Player.black): 6957448259566744474,
-    (Point(row=8, col=17), Player.white): 1902075503512616776,
-    (Point(row=8, col=18), Player.black): 1066230920191779912,
-    (Point(row=8, col=18), Player.white): 6184377508609606384,
-    (Point(row=8, col=19), Player.black): 7077664382202520373,
-    (Point(row=8, col=19), Player.white): 7543691245146511482,
-    (Point(row=9, col=1), Player.black): 3091857846826912600,
-    (Point(row=9, col=1), Player.white): 2903401080579730072,
-    (Point(row=9, col=2), Player.black): 7621865143890017711,
-    (Point(row=9, col=2), Player.white): 1800124297998354819,
-    (Point(row=9, col=3), Player.black): 6710486368368131556,
-    (Point(row=9, col=3), Player.white): 1081393671619788597,
-    (Point(row=9, col=4), Player.black): 4190875727960419334,
-    (Point(row=9, col=4), Player.white): 5404374992579578071,
-    (Point(row=9, col=5), Player.black): 2492812561902852960,
-    (Point(row=9, col=5), Player.white): 2164641598797812852,
-    (Point(row=9, col=6), Player.black): 7170407193085931335,
-    (Point(row=9, col=6), Player.white): 5513893766388479225,
-    (Point(row=9, col=7), Player.black): 3982801183236894100,
-    (Point(row=9, col=7), Player.white): 22011112926202576,
-    (Point(row=9, col=8), Player.black): 6438227617069186462,
-    (Point(row=9, col=8), Player.white): 2313131331306804034,
-    (Point(row=9, col=9), Player.black): 583255474270095535,
-    (Point(row=9, col=9), Player.white): 7449986282906687822,
-    (Point(row=9, col=10), Player.black): 4090411712153257726,
-    (Point(row=9, col=10), Player.white): 3866888757744121263,
-    (Point(row=9, col=11), Player.black): 6884280944550561175,
-    (Point(row=9, col=11), Player.white): 8630714008941182870,
-    (Point(row=9, col=12), Player.black): 728842359994614857,
-    (Point(row=9, col=12), Player.white): 7951132179965012446,
-    (Point(row=9, col=13), Player.black): 898995419142875312,
-    (Point(row=9, col=13), Player.white): 5204464611259590932,
-    (Point(row=9, col=14), Player.black): 1822402185705114778,
-    (Point(row=9, col=14), Player.white): 4006422137157594073,
-    (Point(row=9, col=15), Player.black): 5691072697742323628,
-    (Point(row=9, col=15), Player.white): 4416059776476997768,
-    (Point(row=9, col=16), Player.black): 712425870638164519,
-    (Point(row=9, col=16), Player.white): 6516352072433563324,
-    (Point(row=9, col=17), Player.black): 5862278373696509221,
-    (Point(row=9, col=17), Player.white): 2897338270971451256,
-    (Point(row=9, col=18), Player.black): 106018586697901510,
-    (Point(row=9, col=18), Player.white): 1619423971978147652,
-    (Point(row=9, col=19), Player.black): 8598936366255310154,
-    (Point(row=9, col=19), Player.white): 4409082227364044037,
-    (Point(row=10, col=1), Player.black): 7382257477468661152,
-    (Point(row=10, col=1), Player.white): 8944453848500438251,
-    (Point(row=10, col=2), Player.black): 255897311560715911,
-    (Point(row=10, col=2), Player.white): 7531719042642569770,
-    (Point(row=10, col=3), Player.black): 5449666482010659946,
-    (Point(row=10, col=3), Player.white): 8823025119440216316,
-    (Point(row=10, col=4), Player.black): 6644055562472301190,
-    (Point(row=10, col=4), Player.white): 3278317622128686201,
-    (Point(row=10, col=5), Player.black): 4729570899960006558,
-    (Point(row=10, col=5), Player.white): 355125345620135292,
-    (Point(row=10, col=6), Player.black): 3823180780763196143,
-    (Point(row=10, col=6), Player.white): 3116554769678030212,
-    (Point(row=10, col=7), Player.black): 1090823373687952285,
-    (Point(row=10, col=7), Player.white): 7867908294555043600,
-    (Point(row=10, col=8), Player.black): 8243129571073236942,
-    (Point(row=10, col=8), Player.white): 4990042944257694781,
-    (Point(row=10, col=9), Player.black): 3736516387949835609,
-    (Point(row=10, col=9), Player.white): 2244087550924656668,
-    (Point(row=10, col=10), Player.black): 1758636303518388845,
-    (Point(row=10, col=10), Player.white): 226582445921583308,
-    (Point(row=10, col=11), Player.black): 8359345873617893175,
-    (Point(row=10, col=11), Player.white): 8779372807255821798,
-    (Point(row=10, col=12), Player.black): 1325311033365389796,
-    (Point(row=10, col=12), Player.white): 6510821863529984008,
-    (Point(row=10, col=13), Player.black): 6849765427983104273,
-    (Point(row=10, col=13), Player.white): 31831980218961742,
-    (Point(row=10, col=14), Player.black): 1704117142916698087,
-    (Point(row=10, col=14), Player.white): 2709553068494624488,
-    (Point(row=10, col=15), Player.black): 461982433798714920,
-    (Point(row=10, col=15), Player.white): 957754800394495642,
-    (Point(row=10, col=16), Player.black): 8627085796404032792,
-    (Point(row=10, col=16), Player.white): 5461508334920304,
-    (Point(row=10, col=17), Player.black): 2383704704106358487,
-    (Point(row=10, col=17), Player.white): 9222059328193478728,
-    (Point(row=10, col=18), Player.black): 3315067098899461366,
-    (Point(row=10, col=18), Player.white): 3952029919655106640,
-    (Point(row=10, col=19), Player.black): 4277384240783564085,
-    (Point(row=10, col=19), Player.white): 6013513563697388306,
-    (Point(row=11, col=1), Player.black): 8977399233172902770,
-    (Point(row=11, col=1), Player.white): 2540137903530422537,
-    (Point(row=11, col=2), Player.black): 2651522662861669434,
-    (Point(row=11, col=2), Player.white): 7176593555684380398,
-    (Point(row=11, col=3), Player.black): 4047191278856187992,
-    (Point(row=11, col=3), Player.white): 5167153199299633344,
-    (Point(row=11, col=4), Player.black): 2677715551154867708,
-    (Point(row=11, col=4), Player.white): 708038695464354229,
-    (Point(row=11, col=5), Player.black): 1987227389673119201,
-    (Point(row=11, col=5), Player.white): 3960008354938672202,
-    (Point(row=11, col=6), Player.black): 7602658330077598478,
-    (Point(row=11, col=6), Player.white): 6634869408434144714,
-    (Point(row=11, col=7), Player.black): 8451358304480986523,
-    (Point(row=11, col=7), Player.white): 1817039605658574322,
-    (Point(row=11, col=8), Player.black): 395210324864746026,
-    (Point(row=11, col=8), Player.white): 6511016284812747082,
-    (Point(row=11, col=9), Player.black): 619233584071394795,
-    (Point(row=11, col=9), Player.white): 1083152120914700501,
-    (Point(row=11, col=10), Player.black): 3565195974324339929,
-    (Point(row=11, col=10), Player.white): 9154695439534781946,
-    (Point(row=11, col=11), Player.black): 6780941712785837706,
-    (Point(row=11, col=11), Player.white): 6628232970679180927,
-    (Point(row=11, col=12), Player.black): 6325106202176981815,
-    (Point(row=11, col=12), Player.white): 2366109147400455554,
-    (Point(row=11, col=13), Player.black): 7201547517293699549,
-    (Point(row=11, col=13), Player.white): 4179433727292310038,
-    (Point(row=11, col=14), Player.black): 5487409948313867262,
-    (Point(row=11, col=14), Player.white): 934988409667734508,
-    (Point(row=11, col=15), Player.black): 3097193384698867271,
-    (Point(row=11, col=15), Player.white): 4864297789635076650,
-    (Point(row=11, col=16), Player.black): 4931954028163961454,
-    (Point(row=11, col=16), Player.white): 517225211363023522,
-    (Point(row=11, col=17), Player.black): 9056739141086145965,
-    (Point(row=11, col=17), Player.white): 4355800805748198384,
-    (Point(row=11, col=18), Player.black): 8197183601753458106,
-    (Point(row=11, col=18), Player.white): 7244332748128248179,
-    (Point(row=11, col=19), Player.black): 3769840868875813358,
-    (Point(row=11, col=19), Player.white): 2534611244256330329,
-    (Point(row=12, col=1), Player.black): 5990915534508795592,
-    (Point(row=12, col=1), Player.white): 5682585583054285787,
-    (Point(row=12, col=2), Player.black): 3240444838041064292,
-    (Point(row=12, col=2), Player.white): 8379717204514626207,
-    (Point(row=12, col=3), Player.black): 2097062134078108240,
-    (Point(row=12, col=3), Player.white): 6943873042932439982,
-    (Point(row=12, col=4), Player.black): 4188099487516926472,
-    (Point(row=12, col=4), Player.white): 7940875008375176802,
-    (Point(row=12, col=5), Player.black): 8686542104230113703,
-    (Point(row=12, col=5), Player.white): 3081644715518485750,
-    (Point(row=12, col=6), Player.black): 2920620090043258970,
-    (Point(row=12, col=6), Player.white): 1842043873463661820,
-    (Point(row=12, col=7), Player.black): 4837479409883953253,
-    (Point(row=12, col=7), Player.white): 6588907895426236588,
-    (Point(row=12, col=8), Player.black): 7717685215787134795,
-    (Point(row=12, col=8), Player.white): 5892715591392254775,
-    (Point(row=12, col=9), Player.black): 5822809549438179519,
-    (Point(row=12, col=9), Player.white): 8724645359265231300,
-    (Point(row=12, col=10), Player.black): 8185877948394111473,
-    (Point(row=12, col=10), Player.white): 8523784669296072675,
-    (Point(row=12, col=11), Player.black): 2006274569759469291,
-    (Point(row=12, col=11), Player.white): 8379377443368094551,
-    (Point(row=12, col=12), Player.black): 2904669334883240697,
-    (Point(row=12, col=12), Player.white): 1038961758110051642,
-    (Point(row=12, col=13), Player.black): 4079781276324313395,
-    (Point(row=12, col=13), Player.white): 1889878874323181512,
-    (Point(row=12, col=14), Player.black): 5305599047625283090,
-    (Point(row=12, col=14), Player.white): 1850182739075931645,
-    (Point(row=12, col=15), Player.black): 4514881690532398456,
-    (Point(row=12, col=15), Player.white): 1317171876710899509,
-    (Point(row=12, col=16), Player.black): 2924295418405108818,
-    (Point(row=12, col=16), Player.white): 8254543243869911188,
-    (Point(row=12, col=17), Player.black): 7740785733421092862,
-    (Point(row=12, col=17), Player.white): 4120445268527391218,
-    (Point(row=12, col=18), Player.black): 6910271092153134478,
-    (Point(row=12, col=18), Player.white): 4261195902525141729,
-    (Point(row=12, col=19), Player.black): 2878783767527225720,
-    (Point(row=12, col=19), Player.white): 758521530841591633,
-    (Point(row=13, col=1), Player.black): 5480932943745549956,
-    (Point(row=13, col=1), Player.white): 3029653730225229220,
-    (Point(row=13, col=2), Player.black): 3640706397663361395,
-    (Point(row=13, col=2), Player.white): 7337094813192312006,
-    (Point(row=13, col=3), Player.black): 6224257437283891024,
-    (Point(row=13, col=3), Player.white): 4718475361882964559,
-    (Point(row=13, col=4), Player.black): 8630095130345568714,
-    (Point(row=13, col=4), Player.white): 4928569243354067826,
-    (Point(row=13, col=5), Player.black): 1085761261626211127,
-    (Point(row=13, col=5), Player.white): 1215187669169161936,
-    (Point(row=13, col=6), Player.black): 7398930818583645003,
-    (Point(row=13, col=6), Player.white): 6386244162223508746,
-    (Point(row=13, col=7), Player.black): 113624315990103540,
-    (Point(row=13, col=7), Player.white): 8029902445425667342,
-    (Point(row=13, col=8), Player.black): 8113612269601630560,
-    (Point(row=13, col=8), Player.white): 8153036793893925121,
-    (Point(row=13, col=9), Player.black): 4511241086484488262,
-    (Point(row=13, col=9), Player.white): 2351088402035558502,
-    (Point(row=13, col=10), Player.black): 3004528691857255145,
-    (Point(row=13, col=10), Player.white): 1516431892696216445,
-    (Point(row=13, col=11), Player.black): 4967166290127636067,
-    (Point(row=13, col=11), Player.white): 5663145959309091139,
-    (Point(row=13, col=12), Player.black): 3215135072672743631,
-    (Point(row=13, col=12), Player.white): 7964055391926658940,
-    (Point(row=13, col=13), Player.black): 3505315911336497183,
-    (Point(row=13, col=13), Player.white): 3152230155790442913,
-    (Point(row=13, col=14), Player.black): 7164244834716188583,
-    (Point(row=13, col=14), Player.white): 4129759121596971144,
-    (Point(row=13, col=15), Player.black): 4230738408587519927,
-    (Point(row=13, col=15), Player.white): 4026907855949884592,
-    (Point(row=13, col=16), Player.black): 2216689220136626304,
-    (Point(row=13, col=16), Player.white): 5152414260136567050,
-    (Point(row=13, col=17), Player.black): 8650522479297069999,
-    (Point(row=13, col=17), Player.white): 6706436232598369909,
-    (Point(row=13, col=18), Player.black): 2934624847653661295,
-    (Point(row=13, col=18), Player.white): 4352494223646887095,
-    (Point(row=13, col=19), Player.black): 5124692585917779474,
-    (Point(row=13, col=19), Player.white): 8304046877278674918,
-    (Point(row=14, col=1), Player.black): 4984022536378714736,
-    (Point(row=14, col=1), Player.white): 8930297209341394712,
-    (Point(row=14, col=2), Player.black): 3706562935569208199,
-    (Point(row=14, col=2), Player.white): 3321515511705190388,
-    (Point(row=14, col=3), Player.black): 6664477230907838736,
-    (Point(row=14, col=3), Player.white): 3340972854277229294,
-    (Point(row=14, col=4), Player.black): 1691915434219104429,
-    (Point(row=14, col=4), Player.white): 52959251511065614,
-    (Point(row=14, col=5), Player.black): 7495746487647920746,
-    (Point(row=14, col=5), Player.white): 6108276343839690574,
-    (Point(row=14, col=6), Player.black): 166576135337939931,
-    (Point(row=14, col=6), Player.white): 8305458921648832,
-    (Point(row=14, col=7), Player.black): 1368957950665897374,
-    (Point(row=14, col=7), Player.white): 3907244428102768826,
-    (Point(row=14, col=8), Player.black): 8692275539440673058,
-    (Point(row=14, col=8), Player.white): 2706202683006205067,
-    (Point(row=14, col=9), Player.black): 4088567177507255237,
-    (Point(row=14, col=9), Player.white): 7722669767192796002,
-    (Point(row=14, col=10), Player.black): 1692856297210006329,
-    (Point(row=14, col=10), Player.white): 4137620149649705990,
-    (Point(row=14, col=11), Player.black): 6085647079561639318,
-    (Point(row=14, col=11), Player.white): 6152601182106221414,
-    (Point(row=14, col=12), Player.black): 6250419615906564091,
-    (Point(row=14, col=12), Player.white): 4112535036996232623,
-    (Point(row=14, col=13), Player.black): 3627078085074281517,
-    (Point(row=14, col=13), Player.white): 1160579715683426457,
-    (Point(row=14, col=14), Player.black): 5000505541533788425,
-    (Point(row=14, col=14), Player.white): 6326709226641379819,
-    (Point(row=14, col=15), Player.black): 4174446888431187691,
-    (Point(row=14, col=15), Player.white): 485843284078140835,
-    (Point(row=14, col=16), Player.black): 5290197715155276384,
-    (Point(row=14, col=16), Player.white): 2298597334932398212,
-    (Point(row=14, col=17), Player.black): 3674888392016633645,
-    (Point(row=14, col=17), Player.white): 5874399329371625685,
-    (Point(row=14, col=18), Player.black): 2175475533944526941,
-    (Point(row=14, col=18), Player.white): 7490314815547835034,
-    (Point(row=14, col=19), Player.black): 7512594359928926210,
-    (Point(row=14, col=19), Player.white): 211333305475399967,
-    (Point(row=15, col=1), Player.black): 1584936944269856904,
-    (Point(row=15, col=1), Player.white): 1097341234163515606,
-    (Point(row=15, col=2), Player.black): 4508495793076409370,
-    (Point(row=15, col=2), Player.white): 1407749620828822492,
-    (Point(row=15, col=3), Player.black): 6005311397646408103,
-    (Point(row=15, col=3), Player.white): 8159111451046521078,
-    (Point(row=15, col=4), Player.black): 7246027981390071731,
-    (Point(row=15, col=4), Player.white): 608621146749218697,
-    (Point(row=15, col=5), Player.black): 1985594645062161587,
-    (Point(row=15, col=5), Player.white): 6359422747947650270,
-    (Point(row=15, col=6), Player.black): 3086590578554189026,
-    (Point(row=15, col=6), Player.white): 7009367299425200574,
-    (Point(row=15, col=7), Player.black): 7475087265291707970,
-    (Point(row=15, col=7), Player.white): 4855623144151856128,
-    (Point(row=15, col=8), Player.black): 1052390502602975633,
-    (Point(row=15, col=8), Player.white): 7490791991490109941,
-    (Point(row=15, col=9), Player.black): 212535037131206505,
-    (Point(row=15, col=9), Player.white): 1869795878395378456,
-    (Point(row=15, col=10), Player.black): 6593724074558776483,
-    (Point(row=15, col=10), Player.white): 3901806090562956835,
-    (Point(row=15, col=11), Player.black): 3270126398525774763,
-    (Point(row=15, col=11), Player.white): 7903815348147238657,
-    (Point(row=15, col=12), Player.black): 5266513899417128480,
-    (Point(row=15, col=12), Player.white): 3491719385641178686,
-    (Point(row=15, col=13), Player.black): 847642851817677770,
-    (Point(row=15, col=13), Player.white): 8206901746113485918,
-    (Point(row=15, col=14), Player.black): 3977941826495795519,
-    (Point(row=15, col=14), Player.white): 7193625811964388531,
-    (Point(row=15, col=15), Player.black): 2371446785306818903,
-    (Point(row=15, col=15), Player.white): 704182255019802665,
-    (Point(row=15, col=16), Player.black): 3846796947232154041,
-    (Point(row=15, col=16), Player.white): 5147426074734228337,
-    (Point(row=15, col=17), Player.black): 2609889149169316324,
-    (Point(row=15, col=17), Player.white): 5804455089434928024,
-    (Point(row=15, col=18), Player.black): 1829886461490238521,
-    (Point(row=15, col=18), Player.white): 984046158390750447,
-    (Point(row=15, col=19), Player.black): 5026256241365086177,
-    (Point(row=15, col=19), Player.white): 7399941768349099731,
-    (Point(row=16, col=1), Player.black): 5460680773311340562,
-    (Point(row=16, col=1), Player.white): 6381773857249915686,
-    (Point(row=16, col=2), Player.black): 242598412660908613,
-    (Point(row=16, col=2), Player.white): 6787262510802555138,
-    (Point(row=16, col=3), Player.black): 1714548079081708176,
-    (Point(row=16, col=3), Player.white): 5131116921247638221,
-    (Point(row=16, col=4), Player.black): 5413519731603543874,
-    (Point(row=16, col=4), Player.white): 1089952902192779419,
-    (Point(row=16, col=5), Player.black): 4276149681378355448,
-    (Point(row=16, col=5), Player.white): 9055204596692682263,
-    (Point(row=16, col=6), Player.black): 567602426240897408,
-    (Point(row=16, col=6), Player.white): 215992922966810041,
-    (Point(row=16, col=7), Player.black): 1146336753900628531,
-    (Point(row=16, col=7), Player.white): 7599999768143516359,
-    (Point(row=16, col=8), Player.black): 9202784950673488752,
-    (Point(row=16, col=8), Player.white): 4686760076816898527,
-    (Point(row=16, col=9), Player.black): 9172716840513992337,
-    (Point(row=16, col=9), Player.white): 5876978241895808067,
-    (Point(row=16, col=10), Player.black): 2040767094566276400,
-    (Point(row=16, col=10), Player.white): 1356505907766934413,
-    (Point(row=16, col=11), Player.black): 5404181660638166567,
-    (Point(row=16, col=11), Player.white): 2091924637481535685,
-    (Point(row=16, col=12), Player.black): 1526847980568461377,
-    (Point(row=16, col=12), Player.white): 8833249937276763994,
-    (Point(row=16, col=13), Player.black): 8986515995231746689,
-    (Point(row=16, col=13), Player.white): 2979004657700142879,
-    (Point(row=16, col=14), Player.black): 1550602456480423172,
-    (Point(row=16, col=14), Player.white): 5186200870444270150,
-    (Point(row=16, col=15), Player.black): 904683593113480661,
-    (Point(row=16, col=15), Player.white): 3062691612783485983,
-    (Point(row=16, col=16), Player.black): 5939045249977177414,
-    (Point(row=16, col=16), Player.white): 1837008012890701359,
-    (Point(row=16, col=17), Player.black): 1720983265688587520,
-    (Point(row=16, col=17), Player.white): 1031499527023025239,
-    (Point(row=16, col=18), Player.black): 3508425929765388308,
-    (Point(row=16, col=18), Player.white): 6263834763075419865,
-    (Point(row=16, col=19), Player.black): 2817370210405009746,
-    (Point(row=16, col=19), Player.white): 966457726041041006,
-    (Point(row=17, col=1), Player.black): 5831309660426026277,
-    (Point(row=17, col=1), Player.white): 916641669328623629,
-    (Point(row=17, col=2), Player.black): 6565606918009368478,
-    (Point(row=17, col=2), Player.white): 6746448307213079395,
-    (Point(row=17, col=3), Player.black): 7155090719446145053,
-    (Point(row=17, col=3), Player.white): 7391374431676088580,
-    (Point(row=17, col=4), Player.black): 1277895429564849920,
-    (Point(row=17, col=4), Player.white): 1545609061719422797,
-    (Point(row=17, col=5), Player.black): 5254271028456825191,
-    (Point(row=17, col=5), Player.white): 613602847624217591,
-    (Point(row=17, col=6), Player.black): 7900835009988602293,
-    (Point(row=17, col=6), Player.white): 6676732136660362604,
-    (Point(row=17, col=7), Player.black): 1488858058151698178,
-    (Point(row=17, col=7), Player.white): 7061010909423576507,
-    (Point(row=17, col=8), Player.black): 757254161246360135,
-    (Point(row=17, col=8), Player.white): 2290062444936745384,
-    (Point(row=17, col=9), Player.black): 6296859846656092144,
-    (Point(row=17, col=9), Player.white): 8807144601355447823,
-    (Point(row=17, col=10), Player.black): 4912674911781717927,
-    (Point(row=17, col=10), Player.white): 7016691987393043996,
-    (Point(row=17, col=11), Player.black): 3002354816357194302,
-    (Point(row=17, col=11), Player.white): 3784215929076686264,
-    (Point(row=17, col=12), Player.black): 6829062522580567426,
-    (Point(row=17, col=12), Player.white): 8006734018449633693,
-    (Point(row=17, col=13), Player.black): 7130278374243028137,
-    (Point(row=17, col=13), Player.white): 5910417819494707779,
-    (Point(row=17, col=14), Player.black): 2884858053491275357,
-    (Point(row=17, col=14), Player.white): 8282808153045544592,
-    (Point(row=17, col=15), Player.black): 4745468792544152626,
-    (Point(row=17, col=15), Player.white): 6270119236793019516,
-    (Point(row=17, col=16), Player.black): 2187954259073965298,
-    (Point(row=17, col=16), Player.white): 6883852517787632856,
-    (Point(row=17, col=17), Player.black): 8545834754325086952,
-    (Point(row=17, col=17), Player.white): 7893348556439298788,
-    (Point(row=17, col=18), Player.black): 1110691477466260037,
-    (Point(row=17, col=18), Player.white): 4433628460313258675,
-    (Point(row=17, col=19), Player.black): 8448145587161731834,
-    (Point(row=17, col=19), Player.white): 4873975032132903526,
-    (Point(row=18, col=1), Player.black): 3219316786342347360,
-    (Point(row=18, col=1), Player.white): 3838017260760791198,
-    (Point(row=18, col=2), Player.black): 6536415145748642706,
-    (Point(row=18, col=2), Player.white): 1012061528740438341,
-    (Point(row=18, col=3), Player.black): 4212613769521910564,
-    (Point(row=18, col=3), Player.white): 1713899440438510169,
-    (Point(row=18, col=4), Player.black): 9045207170489366596,
-    (Point(row=18, col=4), Player.white): 8630566243198839512,
-    (Point(row=18, col=5), Player.black): 786351682496918370,
-    (Point(row=18, col=5), Player.white): 2042114652227925088,
-    (Point(row=18, col=6), Player.black): 7562670849511486872,
-    (Point(row=18, col=6), Player.white): 8014314347970021476,
-    (Point(row=18, col=7), Player.black): 8557022520285501110,
-    (Point(row=18, col=7), Player.white): 7836448679874981980,
-    (Point(row=18, col=8), Player.black): 6990608151422863197,
-    (Point(row=18, col=8), Player.white): 7170351910299815359,
-    (Point(row=18, col=9), Player.black): 1292521297489091741,
-    (Point(row=18, col=9), Player.white): 8443663148316397906,
-    (Point(row=18, col=10), Player.black): 3058252852121068860,
-    (Point(row=18, col=10), Player.white): 3582564392048789600,
-    (Point(row=18, col=11), Player.black): 6460834226563907061,
-    (Point(row=18, col=11), Player.white): 8554416609138098319,
-    (Point(row=18, col=12), Player.black): 2322348285973047245,
-    (Point(row=18, col=12), Player.white): 4156969027529856155,
-    (Point(row=18, col=13), Player.black): 7662102730014977139,
-    (Point(row=18, col=13), Player.white): 6330767701623935633,
-    (Point(row=18, col=14), Player.black): 9040546817032563633,
-    (Point(row=18, col=14), Player.white): 791354655637349116,
-    (Point(row=18, col=15), Player.black): 3137804442492098900,
-    (Point(row=18, col=15), Player.white): 7067959651278493754,
-    (Point(row=18, col=16), Player.black): 785808957599612613,
-    (Point(row=18, col=16), Player.white): 1106088307964153311,
-    (Point(row=18, col=17), Player.black): 8293296652204940275,
-    (Point(row=18, col=17), Player.white): 4710579656939494243,
-    (Point(row=18, col=18), Player.black): 7598267353119820599,
-    (Point(row=18, col=18), Player.white): 7224023845991064004,
-    (Point(row=18, col=19), Player.black): 2324438544111400674,
-    (Point(row=18, col=19), Player.white): 6642991215801069861,
-    (Point(row=19, col=1), Player.black): 1033288676907120812,
-    (Point(row=19, col=1), Player.white): 2769635571398338367,
-    (Point(row=19, col=2), Player.black): 5898852074257921496,
-    (Point(row=19, col=2), Player.white): 8155499244878950541,
-    (Point(row=19, col=3), Player.black): 7486311463870557098,
-    (Point(row=19, col=3), Player.white): 6117429297459617287,
-    (Point(row=19, col=4), Player.black): 6685730461228836972,
-    (Point(row=19, col=4), Player.white): 4936744915580091198,
-    (Point(row=19, col=5), Player.black): 2025830535574819296,
-    (Point(row=19, col=5), Player.white): 2720708142676056930,
-    (Point(row=19, col=6), Player.black): 6095840829085158457,
-    (Point(row=19, col=6), Player.white): 3177338054205400464,
-    (Point(row=19, col=7), Player.black): 3233234621244681387,
-    (Point(row=19, col=7), Player.white): 923264459024411530,
-    (Point(row=19, col=8), Player.black): 5774410459232359555,
-    (Point(row=19, col=8), Player.white): 8899116888775044227,
-    (Point(row=19, col=9), Player.black): 7631043998713468667,
-    (Point(row=19, col=9), Player.white): 3159418574793722959,
-    (Point(row=19, col=10), Player.black): 1778804923337711396,
-    (Point(row=19, col=10), Player.white): 3923997876046768824,
-    (Point(row=19, col=11), Player.black): 8631853497428424746,
-    (Point(row=19, col=11), Player.white): 8753675908549996670,
-    (Point(row=19, col=12), Player.black): 1572882019679863004,
-    (Point(row=19, col=12), Player.white): 7587450258233642005,
-    (Point(row=19, col=13), Player.black): 7266144215453046093,
-    (Point(row=19, col=13), Player.white): 7495457709518060480,
-    (Point(row=19, col=14), Player.black): 246032726745616723,
-    (Point(row=19, col=14), Player.white): 4514147199291046676,
-    (Point(row=19, col=15), Player.black): 7236650775119849434,
-    (Point(row=19, col=15), Player.white): 6666628159224517729,
-    (Point(row=19, col=16), Player.black): 6058833461234253504,
-    (Point(row=19, col=16), Player.white): 6649539622787816466,
-    (Point(row=19, col=17), Player.black): 2036975442482943311,
-    (Point(row=19, col=17), Player.white): 1910821233981488427,
-    (Point(row=19, col=18), Player.black): 6403580697315018311,
-    (Point(row=19, col=18), Player.white): 5237671522176738004,
-    (Point(row=19, col=19), Player.black): 7417822070852804886,
-    (Point(row=19, col=19), Player.white): 623888716884004495,
-}
+__all__ = ['EMPTY_BOARD', 'ZobristTable', 'hash_table']
 
-EMPTY_BOARD = 0
\ No newline at end of file
+EMPTY_BOARD = 0
+
+# Every table is drawn from a generator seeded with this and the board size, so hashes are the
+# same from one run (and one process) to the next
+SEED = 'dlgo-zobrist'
+
+MAX63 = 0x7fffffffffffffff
+
+
+class ZobristTable():
+    '''
+    Random 63 bit codes for one board size, built when first asked for.
+    Points are numbered row by row from 0, so Point(row, col) has
+    point_index = (row - 1) * num_cols + (col - 1), and the code for a stone is
+    stones[point_index * 2 + color] with color 0 for black and 1 for white.
+    side_to_move is xored in when white is to move and ko[point_index] when that point
+    is the ko point, for keys that need more than the stones on the board.
+    '''
+    def __init__(self, num_rows, num_cols, seed=SEED):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        num_points = num_rows * num_cols
+        rng = random.Random('%s:%dx%d' % (seed, num_rows, num_cols))
+        self.stones = array('q', (rng.randint(0, MAX63) for _ in range(num_points * 2)))
+        self.side_to_move = rng.randint(0, MAX63)
+        self.ko = array('q', (rng.randint(0, MAX63) for _ in range(num_points)))
+
+    def point_index(self, point):
+        return (point.row - 1) * self.num_cols + (point.col - 1)
+
+    def stone(self, point, player):
+        return self.stones[self.point_index(point) * 2 + player.value - 1]
+
+    def key(self, board_hash, next_player, ko_point=None):
+        # Extends a board hash with the side to move and, if there is one, the ko point
+        if next_player == Player.white:
+            board_hash ^= self.side_to_move
+        if ko_point is not None:
+            board_hash ^= self.ko[self.point_index(ko_point)]
+        return board_hash
+
+    def __reduce__(self):
+        # Tables are rebuilt from their size (and shared) instead of pickling the codes
+        return (hash_table, (self.num_rows, self.num_cols))
+
+
+_TABLES = {}
+
+def hash_table(num_rows, num_cols):
+    table = _TABLES.get((num_rows, num_cols))
+    if table is None:
+        table = ZobristTable(num_rows, num_cols)
+        _TABLES[num_rows, num_cols] = table
+    return table
@@ -1,21 +1,41 @@
+import os
+import sys
+
 import numpy as np
 from keras.models import Sequential
 from keras.layers import Dense, Dropout, Flatten
 from keras.layers import Conv2D, MaxPooling2D
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from dlgo.data import ArrayDataset, BatchGenerator, SymmetryAugmenter, split_indices
+
 np.random.seed(123)
-X=np.load('../../generated_game_data/features-40k.npy')
-Y=np.load('../../generated_game_data/labels-40k.npy')
+# The features are memory mapped and the labels are int16 point indices, so batches are read,
+# shuffled and turned into one-hot targets only when the model asks for them
+X=np.load('../../generated_game_data/features-40k.npy', mmap_mode='r')
+Y=np.load('../../generated_game_data/labels-40k.npy', mmap_mode='r')
 
 samples=X.shape[0]
 size=9
 input_shape=(size, size, 1)
 
-X=X.reshape(samples, size, size, 1)
+# Training batches are shown in a random one of the 8 board symmetries, which multiplies the
+# positions the model sees without storing any more of them
+augment=SymmetryAugmenter(size, size, seed=123)
+
+def to_input_shape(features, labels):
+    return features.reshape(len(features), size, size, 1), labels
+
+def augment_batch(features, labels):
+    return to_input_shape(*augment(features, labels))
 
-train_samples=int(0.9 * samples)
-X_train, X_test = X[:train_samples], X[train_samples:]
-Y_train, Y_test = Y[:train_samples], Y[train_samples:]
+dataset=ArrayDataset(features=X, labels=Y)
+train_indices, test_indices = split_indices(samples, test_fraction=0.1)
+batch_size=64
+train_batches=BatchGenerator(dataset, train_indices, batch_size, size * size, seed=123,
+                             transform=augment_batch)
+test_batches=BatchGenerator(dataset, test_indices, batch_size, size * size, shuffle=False,
+                            transform=to_input_shape)
 
 model = Sequential()
 model.add(Conv2D(filters=48,
@@ -41,12 +61,11 @@ model.compile(loss='categorical_crossentropy',
               optimizer='sgd',
               metrics=['accuracy'])
 
-model.fit(X_train, Y_train,
-          batch_size=64,
+model.fit(train_batches.keras_sequence(),
           epochs=100,
           verbose=1,
-          validation_data=(X_test, Y_test))
+          validation_data=test_batches.keras_sequence())
 
-score = model.evaluate(X_test, Y_test, verbose=0)
+score = model.evaluate(test_batches.keras_sequence(), verbose=0)
 print('Test loss:', score[0])
 print('Test accuracy:', score[1])
\ No newline at end of file
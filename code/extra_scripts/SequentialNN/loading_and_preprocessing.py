@@ -1,19 +1,28 @@
+import os
+import sys
+
 import numpy as np
 from keras.models import Sequential
 from keras.layers import Dense
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from dlgo.data import ArrayDataset, BatchGenerator, split_indices
+
 np.random.seed(123)
-X = np.load('../generated_game_data/features-40k.npy')
-Y = np.load('../generated_game_data/labels-40k.npy')
+# The features are memory mapped and the labels are int16 point indices, so batches are read,
+# shuffled and turned into one-hot targets only when the model asks for them
+X = np.load('../generated_game_data/features-40k.npy', mmap_mode='r')
+Y = np.load('../generated_game_data/labels-40k.npy', mmap_mode='r')
 samples = X.shape[0]
 board_size = 9*9
 
 X = X.reshape(samples, board_size)
-Y = Y.reshape(samples, board_size)
 
-train_samples = int(0.9 * samples)
-X_train, X_test = X[:train_samples], X[train_samples:]
-Y_train, Y_test = Y[:train_samples], Y[train_samples:]
+dataset = ArrayDataset(features=X, labels=Y)
+train_indices, test_indices = split_indices(samples, test_fraction=0.1)
+batch_size = 64
+train_batches = BatchGenerator(dataset, train_indices, batch_size, board_size, seed=123)
+test_batches = BatchGenerator(dataset, test_indices, batch_size, board_size, shuffle=False)
 
 model = Sequential()
 model.add(Dense(1000, activation='sigmoid', input_shape=(board_size,)))
@@ -25,12 +34,11 @@ model.compile(loss='mean_squared_error',
               optimizer='sgd',
               metrics=['accuracy'])
 
-model.fit(X_train, Y_train,
-          batch_size=64,
+model.fit(train_batches.keras_sequence(),
           epochs=15,
           verbose=1,
-          validation_data=(X_test, Y_test))
+          validation_data=test_batches.keras_sequence())
 
-score = model.evaluate(X_test, Y_test, verbose=0)
+score = model.evaluate(test_batches.keras_sequence(), verbose=0)
 print('Test loss:', score[0])
 print('Test accuracy:', score[1])
\ No newline at end of file
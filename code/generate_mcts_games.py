@@ -1,39 +1,137 @@
 import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import numpy as np
 
+from dlgo.data import ShardWriter
 from dlgo.encoders import get_encoder_by_name
-from dlgo import goboard
+from dlgo import goboard_fast as goboard
 from dlgo import agent
 from dlgo.utils import print_board, print_move
 
-def generate_game(board_size, rounds, max_moves, temperature):
-    boards, moves = [], []
+def generate_game(board_size, rounds, max_moves, temperature, seed=None, verbose=True,
+                  policy_width=None):
+    '''
+    Plays one game of MCTS self-play and returns its samples as a dict of arrays:
+    features --> the encoded boards
+    labels --> the point index of the move played
+    players --> the value of the player to move, which the dedup stage needs to key positions
+    policy_points, policy_counts --> the visited root moves and their rollouts, the root
+        visit distribution (-1 marks an unused slot; passing and resigning are left out).
+        By default every point has room; a smaller policy_width keeps only the most visited
+        moves, which truncates the distribution
+    values --> the share of the root rollouts won by the player to move
+    '''
+    boards, moves, players = [], [], []
+    policy_points, policy_counts, values = [], [], []
 
     encoder = get_encoder_by_name('oneplane', board_size)
+    if policy_width is None:
+        policy_width = encoder.num_points()
 
     game = goboard.GameState.new_game(board_size)
 
-    bot = agent.MCTSAgent(rounds, temperature)
+    bot = agent.MCTSAgent(rounds, temperature, reuse_tree=True, seed=seed)
 
     num_moves = 0
     while not game.is_over():
-        print_board(game.board)
-        move = bot.select_move(game)
+        if verbose:
+            print_board(game.board)
+        move, stats = bot.select_move_with_stats(game)
         if move.is_play:
             boards.append(encoder.encode(game))
+            points, counts = visit_distribution(encoder, stats, policy_width)
+            policy_points.append(points)
+            policy_counts.append(counts)
+            values.append(stats.value)
 
-            # Using one hot encoding to encode each move
-            move_one_hot = np.zeros(encoder.num_points())
-            move_one_hot[encoder.encode_point(move.point)] = 1
-            moves.append(move_one_hot)
+            # Each move is stored as the index of its point; dlgo.data.expand_labels turns
+            # a batch of these into one-hot targets when training
+            moves.append(encoder.encode_point(move.point))
+            players.append(game.next_player.value)
 
-        print_move(game.next_player, move)
+        if verbose:
+            print_move(game.next_player, move)
         game = game.apply_move(move)
         num_moves += 1
         if num_moves > max_moves:
             break
 
-    return np.array(boards), np.array(moves)
+    return {
+        'features': np.array(boards),
+        'labels': np.array(moves, dtype=np.int16),
+        'players': np.array(players, dtype=np.int8),
+        'policy_points': np.array(policy_points, dtype=np.int16).reshape(-1, policy_width),
+        'policy_counts': np.array(policy_counts, dtype=np.float32).reshape(-1, policy_width),
+        'values': np.array(values, dtype=np.float32),
+    }
+
+def visit_distribution(encoder, stats, width):
+    # The width most visited root moves that play a stone, as point indices and rollout counts
+    visited = sorted(
+        ((rollouts, encoder.encode_point(move.point))
+         for move, (_, rollouts) in stats.move_stats.items() if move.is_play),
+        reverse=True)[:width]
+    points = np.full(width, -1, dtype=np.int16)
+    counts = np.zeros(width, dtype=np.float32)
+    for slot, (rollouts, point) in enumerate(visited):
+        points[slot] = point
+        counts[slot] = rollouts
+    return points, counts
+
+def _generate_game_worker(job):
+    # Runs in a worker process: one game with its own seed and no per-move output
+    board_size, rounds, max_moves, temperature, seed, policy_width = job
+    return generate_game(board_size, rounds, max_moves, temperature, seed=seed, verbose=False,
+                         policy_width=policy_width)
+
+def generate_games(args, skip=()):
+    '''
+    Yields (game number, arrays from generate_game) for each game as soon as it is finished. With more
+    than one worker the games are spread over a pool of processes and come back in the order
+    they finish. Every game gets its own seed, drawn from --seed if it is given, so a resumed
+    run plays the games it still needs with the same seeds. Game numbers in skip are not played.
+    '''
+    rng = random.Random(args.seed)
+    jobs = [
+        (args.board_size, args.rounds, args.max_moves, args.temperature, rng.randrange(2 ** 31),
+         args.policy_width)
+        for _ in range(args.num_games)
+    ]
+    todo = [i for i in range(args.num_games) if i not in skip]
+    if args.workers <= 1:
+        for i in todo:
+            board_size, rounds, max_moves, temperature, seed, policy_width = jobs[i]
+            print('Generating game %d/%d...' % (i + 1, args.num_games))
+            yield i, generate_game(
+                board_size, rounds, max_moves, temperature, seed=seed, verbose=not args.quiet,
+                policy_width=policy_width)
+        return
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(_generate_game_worker, jobs[i]): i for i in todo}
+        for finished, future in enumerate(as_completed(futures)):
+            print('Finished game %d/%d' % (finished + 1, len(todo)))
+            yield futures[future], future.result()
+
+def write_shards(args):
+    # Streams every finished game into the shards in --out-dir, skipping games already there
+    if args.policy_width is None:
+        args.policy_width = args.board_size * args.board_size
+    metadata = {
+        'encoder': 'oneplane',
+        'board_size': args.board_size,
+        'rounds': args.rounds,
+        'temperature': args.temperature,
+        'max_moves': args.max_moves,
+        'policy_width': args.policy_width,
+    }
+    with ShardWriter(args.out_dir, shard_size=args.shard_size, metadata=metadata) as writer:
+        if writer.completed_games:
+            print('Resuming: %d games already written' % len(writer.completed_games))
+        for i, arrays in generate_games(args, skip=writer.completed_games):
+            writer.add_game(i, **arrays)
 
 def main():
     print('ENTERING MAIN')
@@ -44,18 +142,34 @@ def main():
     parser.add_argument('--max-moves', '-m', type=int, default=60,
                         help='Max moves per game.')
     parser.add_argument('--num-games', '-n', type=int, default=10)
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Number of processes playing games at the same time.')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Seed for the per-game seeds, to make a run repeatable.')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Do not print the board and move after every move.')
     parser.add_argument('--board-out')
     parser.add_argument('--move-out')
+    parser.add_argument('--out-dir',
+                        help='Write the games to resumable shards in this directory '
+                             'instead of --board-out and --move-out.')
+    parser.add_argument('--shard-size', type=int, default=4096,
+                        help='Samples per shard with --out-dir.')
+    parser.add_argument('--policy-width', type=int, default=None,
+                        help='Most visited root moves stored per sample with --out-dir '
+                             '(default: every point, so the whole visit distribution).')
 
     args = parser.parse_args()
+    if args.out_dir:
+        write_shards(args)
+        return
+
     xs = []
     ys = []
 
-    for i in range(args.num_games):
-        print('Generating game %d/%d...' % (i + 1, args.num_games))
-        x, y = generate_game(args.board_size, args.rounds, args.max_moves, args.temperature)
-        xs.append(x)
-        ys.append(y)
+    for _, arrays in generate_games(args):
+        xs.append(arrays['features'])
+        ys.append(arrays['labels'])
 
     x = np.concatenate(xs)
     y = np.concatenate(ys)
@@ -64,4 +178,4 @@ def main():
     np.save(args.move_out, y)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
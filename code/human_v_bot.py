@@ -1,14 +1,22 @@
 from dlgo import agent
-from dlgo import goboard
+from dlgo import goboard_fast as goboard
 from dlgo import gotypes
 from dlgo.utils import print_board, print_move, point_from_coords
 
 BOARD_SIZE = 5
 HUMAN_PLAYS_BLACK = False
+# The bot thinks for at most this many seconds (and at most 500 rounds) per move
+BOT_SECONDS = 5
+
+def show_progress(stats):
+    # Overwrites one status line while the bot is thinking
+    print('\rThinking... %d rollouts, best move so far: %s' % (stats.rounds, stats.best_move),
+          end='', flush=True)
 
 def main():
     game = goboard.GameState.new_game(BOARD_SIZE)
-    bot = agent.MCTSAgent(500, temperature=1.4)
+    bot = agent.MCTSAgent(500, temperature=1.4, max_seconds=BOT_SECONDS,
+                          report_interval=0.5, on_progress=show_progress)
     human_player_type = gotypes.Player.black if HUMAN_PLAYS_BLACK else gotypes.Player.white
     previous_move = None
 
@@ -25,6 +33,7 @@ def main():
             move = goboard.Move.play(point)
         else:
             move = bot.select_move(game)
+            print()
         
         # Storing previous move to print on screen
         previous_move = {'player': 'Black' if game.next_player == gotypes.Player.black else 'White', 